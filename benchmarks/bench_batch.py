@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量生成性能测试：比较 batch_generate_quizzes 在 1 到 N 个进程下的耗时
+
+用法: python benchmarks/bench_batch.py [--files 48] [--rows 500] [--chunksize 2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from components.quiz_generator import QuizGenerator
+from synthetic import make_workbook
+
+
+def main():
+    parser = argparse.ArgumentParser(description="batch_generate_quizzes 多进程扩展性测试")
+    parser.add_argument("--files", type=int, default=48, help="工作簿数量")
+    parser.add_argument("--rows", type=int, default=500, help="每个工作簿的题目数")
+    parser.add_argument("--chunksize", type=int, default=2, help="每个任务包含的文件数")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="最大进程数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_dir = os.path.join(work_dir, "inputs")
+        os.makedirs(input_dir)
+        make_workbook(os.path.join(input_dir, "template.xlsx"), args.rows)
+        template_bytes = open(os.path.join(input_dir, "template.xlsx"), "rb").read()
+        excel_files = []
+        for i in range(args.files):
+            path = os.path.join(input_dir, f"quiz_{i:04d}.xlsx")
+            with open(path, "wb") as f:
+                f.write(template_bytes)
+            excel_files.append(path)
+
+        generator = QuizGenerator()
+        generator.outputs_dir = os.path.join(work_dir, "outputs")
+        os.makedirs(generator.outputs_dir)
+
+        print(f"{args.files} 个文件 x {args.rows} 道题目, chunksize={args.chunksize}")
+        print(f"{'进程数':>6} {'耗时(s)':>10} {'加速比':>8}")
+        worker_counts = sorted({args.max_workers} | {2 ** k for k in range(args.max_workers.bit_length()) if 2 ** k <= args.max_workers})
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            results = generator.batch_generate_quizzes(excel_files, max_workers=workers, chunksize=args.chunksize)
+            elapsed = time.perf_counter() - start
+            failed = [result.error for result in results if not result.ok]
+            if failed:
+                raise SystemExit(f"生成失败: {failed[0]}")
+            baseline = baseline or elapsed
+            print(f"{workers:>6} {elapsed:>10.2f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
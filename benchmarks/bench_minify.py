@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+压缩输出对比：统计 outputs/generated_quizzes 中已生成页面压缩前后的原始大小和 gzip 后大小，
+并用合成题库比较 minify 关闭与开启时生成页面的体积和耗时
+
+用法: python benchmarks/bench_minify.py [--dir outputs/generated_quizzes] [--rows 2000]
+"""
+
+import argparse
+import glob
+import gzip
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from components.minify import minify_html
+from components.quiz_generator import QuizGenerator, REQUIRED_COLUMNS
+from synthetic import make_rows, parse_mix
+
+
+def sizes(text: str):
+    """返回原始大小和 gzip 后大小（字节）"""
+    data = text.encode('utf-8')
+    return len(data), len(gzip.compress(data, compresslevel=6))
+
+
+def saving(before: int, after: int) -> str:
+    return f"{(1 - after / before) * 100 if before else 0.0:.1f}%"
+
+
+def report_directory(directory: str):
+    """逐个压缩目录中的页面并输出体积变化及合计"""
+    files = sorted(glob.glob(os.path.join(directory, "*.html")))
+    if not files:
+        print(f"{directory} 中没有HTML文件")
+        return
+    print(f"{'文件':<30} {'原始(KB)':>10} {'压缩(KB)':>10} {'节省':>7} {'gzip(KB)':>10} {'gzip压缩(KB)':>13} {'节省':>7}")
+    totals = [0, 0, 0, 0]
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        raw, raw_gzip = sizes(html)
+        minified, minified_gzip = sizes(minify_html(html))
+        for i, value in enumerate((raw, minified, raw_gzip, minified_gzip)):
+            totals[i] += value
+        print(f"{os.path.basename(path):<30} {raw / 1024:>10.1f} {minified / 1024:>10.1f} {saving(raw, minified):>7} "
+              f"{raw_gzip / 1024:>10.1f} {minified_gzip / 1024:>13.1f} {saving(raw_gzip, minified_gzip):>7}")
+    raw, minified, raw_gzip, minified_gzip = totals
+    print(f"{f'合计 ({len(files)} 个文件)':<30} {raw / 1024:>10.1f} {minified / 1024:>10.1f} {saving(raw, minified):>7} "
+          f"{raw_gzip / 1024:>10.1f} {minified_gzip / 1024:>13.1f} {saving(raw_gzip, minified_gzip):>7}")
+
+
+def report_pipeline(rows: int, mix: str, seed: int):
+    """用合成题库比较 minify 关闭与开启时生成的页面"""
+    df = pd.DataFrame(make_rows(rows, parse_mix(mix), seed=seed), columns=REQUIRED_COLUMNS)
+    generator = QuizGenerator()
+    questions = generator.process_questions(df)
+    print(f"\n合成题库 {rows} 题:")
+    print(f"{'格式':>8} {'题目结构':>12} {'压缩':>4} {'页面(KB)':>10} {'gzip(KB)':>10} {'生成(ms)':>10}")
+    for payload_format, question_markup in (("json", "prerendered"), ("compact", "lazy")):
+        generator.payload_format = payload_format
+        generator.question_markup = question_markup
+        for minify in (False, True):
+            generator.minify = minify
+            # 第一次生成包含压缩静态片段的耗时，计时取之后的结果
+            generator.generate_quiz_html(questions, "benchmark")
+            start = time.perf_counter()
+            page = generator.generate_quiz_html(questions, "benchmark")
+            elapsed = (time.perf_counter() - start) * 1000
+            raw, raw_gzip = sizes(page)
+            print(f"{payload_format:>8} {question_markup:>12} {'是' if minify else '否':>4} {raw / 1024:>10.1f} "
+                  f"{raw_gzip / 1024:>10.1f} {elapsed:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="压缩输出的体积与耗时对比")
+    parser.add_argument("--dir", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                      "outputs", "generated_quizzes"), help="已生成页面所在目录")
+    parser.add_argument("--rows", type=int, default=2000, help="合成题库题目数，为 0 时不生成")
+    parser.add_argument("--mix", default="4,3,2,1", help="四选项,三选项,填空题,其他选择题 的比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    report_directory(args.dir)
+    if args.rows > 0:
+        report_pipeline(args.rows, args.mix, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目数据格式对比：比较 payload_format="json" 与 "compact" 的页面体积和脚本解析耗时
+
+解析耗时在安装了 node 时测量 JavaScript 端的解析与还原，否则以 Python json.loads 近似。
+
+用法: python benchmarks/bench_payload.py [--sizes 100 1000 10000]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.quiz_generator import QuizGenerator
+
+NODE_HARNESS = """
+const fs = require('fs');
+const source = fs.readFileSync(process.argv[2], 'utf8') + '\\n;originalQuestions;';
+const runs = 20;
+let start = process.hrtime.bigint();
+for (let i = 0; i < runs; i++) {
+    (0, eval)(source.replace(/^let /gm, 'var '));
+}
+console.log(Number(process.hrtime.bigint() - start) / 1e6 / runs);
+"""
+
+
+def make_questions(count: int):
+    """构造与 process_questions 输出格式相同的题目列表"""
+    questions = []
+    for i in range(count):
+        if i % 3 == 0:
+            questions.append({'id': i + 1, 'question': f'第{i}题 He ___ to school yesterday.', 'type': '填空题', 'answer': 'went', 'options': []})
+        elif i % 3 == 1:
+            options = [{'label': label, 'text': f'选项{label}{i}'} for label in 'ABC']
+            questions.append({'id': i + 1, 'question': f'第{i}题 三选一', 'type': '三选项选择题', 'answer': options[2]['text'], 'options': options})
+        else:
+            options = [{'label': label, 'text': f'选项内容{label}{i}'} for label in 'ABCD']
+            questions.append({'id': i + 1, 'question': f'第{i}题 下列哪一项是正确的？', 'type': '四选项选择题', 'answer': options[1]['text'], 'options': options})
+    return questions
+
+
+def data_script(generator: QuizGenerator, questions) -> str:
+    """截取脚本中声明题目数据的部分（不含运行时代码）"""
+    script = generator.generate_quiz_javascript(questions)
+    return script[:script.index('let questions = [...originalQuestions];')]
+
+
+def parse_time_ms(script: str, payload_format: str, work_dir: str) -> float:
+    node = shutil.which('node')
+    if node:
+        script_path = os.path.join(work_dir, f"{payload_format}.js")
+        harness_path = os.path.join(work_dir, "harness.js")
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(script)
+        with open(harness_path, 'w', encoding='utf-8') as f:
+            f.write(NODE_HARNESS)
+        output = subprocess.run([node, harness_path, script_path], capture_output=True, text=True, check=True)
+        return float(output.stdout.strip())
+
+    body = script[script.index('=') + 1:].strip().rstrip(';')
+    if body.startswith('decodeQuestions('):
+        body = body[len('decodeQuestions('):-1]
+    start = time.perf_counter()
+    for _ in range(20):
+        json.loads(body)
+    return (time.perf_counter() - start) * 1000 / 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="题目数据格式体积与解析耗时对比")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="题目数量")
+    args = parser.parse_args()
+
+    generator = QuizGenerator()
+    print(f"解析耗时测量方式: {'node' if shutil.which('node') else 'python json.loads'}")
+    print(f"{'题目数':>8} {'格式':>8} {'数据(KB)':>10} {'页面(KB)':>10} {'解析(ms)':>10}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for count in args.sizes:
+            questions = make_questions(count)
+            for payload_format in ("json", "compact"):
+                generator.payload_format = payload_format
+                script = data_script(generator, questions)
+                page = generator.generate_quiz_html(questions, "benchmark")
+                print(f"{count:>8} {payload_format:>8} {len(script.encode('utf-8')) / 1024:>10.1f} "
+                      f"{len(page.encode('utf-8')) / 1024:>10.1f} {parse_time_ms(script, payload_format, work_dir):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
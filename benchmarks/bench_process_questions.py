@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目标准化性能测试：比较列式 process_questions 与原逐行实现在 1k/10k/100k 行下的耗时，
+并校验两者输出完全一致
+
+用法: python benchmarks/bench_process_questions.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.quiz_generator import QuizGenerator, grading_index
+
+
+def make_dataframe(rows: int) -> pd.DataFrame:
+    """构造与 read_excel_file 返回格式相同的题库数据"""
+    data = []
+    for i in range(rows):
+        kind = i % 4
+        if kind == 0:
+            data.append({'题干': f'第{i}题 apple 的中文是？', '选项A': '苹果', '选项B': ' 香蕉 ', '选项C': '橙子', '选项D': '葡萄', '答案': 'a'})
+        elif kind == 1:
+            data.append({'题干': f'第{i}题 三选项', '选项A': 'x', '选项B': 'y', '选项C': 'z', '选项D': '', '答案': 'C'})
+        elif kind == 2:
+            data.append({'题干': f'第{i}题 He ___ to school.', '选项A': '', '选项B': '', '选项C': '', '选项D': '', '答案': ' went '})
+        else:
+            data.append({'题干': f'第{i}题 判断', '选项A': '对', '选项B': 3, '选项C': '', '选项D': '', '答案': 'E'})
+    return pd.DataFrame(data)
+
+
+def legacy_process_questions(generator: QuizGenerator, df: pd.DataFrame):
+    """原逐行实现（apply + iterrows），作为对照基准"""
+    questions = []
+    df['题目类型'] = df.apply(generator.identify_question_type, axis=1)
+    for index, row in df.iterrows():
+        question_data = {
+            'id': index + 1,
+            'question': str(row['题干']).strip(),
+            'type': row['题目类型'],
+            'answer': str(row['答案']).strip(),
+            'options': []
+        }
+        if '选择题' in row['题目类型']:
+            options = []
+            answer_letter = str(row['答案']).strip().upper()
+            correct_answer_text = ""
+            for opt_key in ['选项A', '选项B', '选项C', '选项D']:
+                opt_value = str(row[opt_key]).strip()
+                if opt_value:
+                    option_letter = opt_key[-1]
+                    options.append({'label': option_letter, 'text': opt_value})
+                    if option_letter == answer_letter:
+                        correct_answer_text = opt_value
+                        question_data['correct'] = len(options) - 1
+            question_data['options'] = options
+            question_data['answer'] = correct_answer_text if correct_answer_text else str(row['答案']).strip()
+        if 'correct' not in question_data:
+            question_data.update(grading_index(question_data))
+        questions.append(question_data)
+    return questions
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_questions 列式实现性能测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="题目行数")
+    args = parser.parse_args()
+
+    generator = QuizGenerator()
+    print(f"{'行数':>8} {'逐行(s)':>10} {'列式(s)':>10} {'加速比':>8}")
+    for rows in args.sizes:
+        df = make_dataframe(rows)
+        expected, legacy_time = timed(legacy_process_questions, generator, df.copy())
+        actual, vectorized_time = timed(generator.process_questions, df.copy())
+        if actual != expected:
+            raise SystemExit(f"{rows} 行: 列式实现输出与原实现不一致")
+        print(f"{rows:>8} {legacy_time:>10.3f} {vectorized_time:>10.3f} {legacy_time / vectorized_time:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
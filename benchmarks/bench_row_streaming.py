@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+逐块读取内存测试：比较整表读取与 stream_chunk_size 逐块读取生成同一题库时的峰值内存，
+并校验两种方式生成的文件完全一致
+
+用法: python benchmarks/bench_row_streaming.py [--rows 50000] [--chunk-size 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.quiz_generator import QuizGenerator
+
+
+def make_workbook(path: str, rows: int):
+    """使用 openpyxl 只写模式生成大题库"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['题干', '选项A', '选项B', '选项C', '选项D', '答案'])
+    for i in range(rows):
+        if i % 3 == 0:
+            sheet.append([f'第{i}题 He ___ to school yesterday.', None, None, None, None, 'went'])
+        else:
+            sheet.append([f'第{i}题 下列哪一项是正确的？', f'苹果{i}', f'香蕉{i}', f'橙子{i}', f'葡萄{i}', 'B'])
+    workbook.save(path)
+
+
+def measure(generator: QuizGenerator, excel_path: str):
+    """返回 (峰值内存MB, 耗时秒, 输出内容)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    output_path, _ = generator.generate_quiz_from_excel(excel_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    with open(output_path, 'rb') as f:
+        return peak / 1024 / 1024, elapsed, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="stream_chunk_size 峰值内存测试")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000], help="题目行数")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="每块行数")
+    args = parser.parse_args()
+
+    generator = QuizGenerator()
+    generator.excel_engine = "openpyxl-stream"
+    print(f"{'行数':>8} {'整表峰值(MB)':>14} {'逐块峰值(MB)':>14} {'整表(s)':>9} {'逐块(s)':>9} {'文件一致':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        generator.outputs_dir = work_dir
+        for rows in args.rows:
+            excel_path = os.path.join(work_dir, f"bank_{rows}.xlsx")
+            make_workbook(excel_path, rows)
+
+            generator.stream_chunk_size = 0
+            whole_peak, whole_time, whole_output = measure(generator, excel_path)
+            generator.stream_chunk_size = args.chunk_size
+            stream_peak, stream_time, stream_output = measure(generator, excel_path)
+            print(f"{rows:>8} {whole_peak:>14.1f} {stream_peak:>14.1f} {whole_time:>9.2f} {stream_time:>9.2f} "
+                  f"{str(whole_output == stream_output):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面脚本微基准：用合成题库生成测试页面，并附加在浏览器中运行的计时脚本
+
+打开生成的页面后自动依次测量 startQuiz、逐题 showQuestion、逐题作答（selectOption / 填空输入）、
+上一题/下一题和 submitQuiz 的耗时，结果显示在页面右上角，同时输出到控制台（window.benchmarkResults）。
+可在低端手机上打开同一页面比较不同版本的页面脚本。
+
+用法: python benchmarks/bench_runtime.py [--rows 2000] [--output outputs/benchmarks/runtime_2000.html]
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from components.quiz_generator import QuizGenerator, REQUIRED_COLUMNS
+from synthetic import make_rows, parse_mix
+
+# 在页面加载完成后运行的计时脚本
+BENCHMARK_SCRIPT = """
+    <script>
+    // 页面脚本微基准：每项操作之后读取一次布局，计入样式与布局的耗时
+    (function () {
+        function measure(label, count, action) {
+            const start = performance.now();
+            action();
+            void document.body.offsetHeight;
+            const total = performance.now() - start;
+            return { '操作': label, '次数': count, '总耗时(ms)': +total.toFixed(2), '每次(ms)': +(total / count).toFixed(4) };
+        }
+
+        function answer(index, correct) {
+            const question = questions[index];
+            if (question.type === '填空题') {
+                const input = document.getElementById(`answer_${index}`);
+                input.value = correct ? question.answer : '?';
+                input.dispatchEvent(new Event('input', { bubbles: true }));
+                return;
+            }
+            const right = question.options.findIndex(option => option.text === question.answer);
+            selectOption(index, correct ? right : (right + 1) % question.options.length);
+        }
+
+        function run() {
+            const count = originalQuestions.length;
+            const steps = Math.min(count - 1, 500);
+            const rows = [];
+            rows.push(measure('startQuiz', 1, () => startQuiz()));
+            rows.push(measure('showQuestion', count, () => {
+                for (let i = 0; i < count; i++) showQuestion(i);
+            }));
+            rows.push(measure('作答', count, () => {
+                for (let i = 0; i < count; i++) {
+                    showQuestion(i);
+                    answer(i, i % 3 !== 0);
+                }
+            }));
+            rows.push(measure('上一题/下一题', steps * 2, () => {
+                for (let i = 0; i < steps; i++) previousQuestion();
+                for (let i = 0; i < steps; i++) nextQuestion();
+            }));
+            rows.push(measure('submitQuiz', 1, () => submitQuiz()));
+
+            window.benchmarkResults = rows;
+            console.table(rows);
+            const panel = document.createElement('pre');
+            panel.id = 'benchmarkResults';
+            panel.style.cssText = 'position:fixed;top:8px;right:8px;z-index:9999;margin:0;padding:10px;' +
+                'background:rgba(0,0,0,.85);color:#fff;font-size:12px;border-radius:6px;max-width:95vw;overflow:auto;';
+            panel.textContent = `题目数: ${count}\\n` + rows.map(row =>
+                `${row['操作']}: ${row['总耗时(ms)']} ms / ${row['次数']} 次 = ${row['每次(ms)']} ms`).join('\\n');
+            document.body.appendChild(panel);
+        }
+
+        window.addEventListener('load', () => setTimeout(run, 100));
+    })();
+    </script>
+"""
+
+
+def build_page(generator: QuizGenerator, rows: int, mix: str, seed: int) -> str:
+    """生成附带计时脚本的测试页面"""
+    df = pd.DataFrame(make_rows(rows, parse_mix(mix), seed=seed), columns=REQUIRED_COLUMNS)
+    questions = generator.process_questions(df)
+    html = generator.generate_quiz_html(questions, f"页面脚本基准 ({rows} 题)", "benchmark")
+    return html.replace("</body>", BENCHMARK_SCRIPT + "</body>", 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成页面脚本微基准页面")
+    parser.add_argument("--rows", type=int, default=2000, help="题目数")
+    parser.add_argument("--mix", default="4,3,2,1", help="四选项,三选项,填空题,其他选择题 的比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--payload-format", choices=("json", "compact"), default="json", help="题目数据嵌入格式")
+    parser.add_argument("--question-markup", choices=("prerendered", "lazy"), default="prerendered",
+                        help="题目结构生成方式")
+    parser.add_argument("--output", help="输出的HTML文件路径，默认为 outputs/benchmarks/runtime_<题目数>.html")
+    args = parser.parse_args()
+
+    generator = QuizGenerator()
+    generator.payload_format = args.payload_format
+    generator.question_markup = args.question_markup
+    output = args.output or os.path.join(os.path.dirname(generator.outputs_dir), "benchmarks",
+                                         f"runtime_{args.rows}.html")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(build_page(generator, args.rows, args.mix, args.seed))
+    print(f"已生成 {output}，在浏览器中打开后查看右上角的计时结果")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML写出内存测试：比较整页拼接后写出与 write_quiz_html 逐段写出的峰值内存
+
+用法: python benchmarks/bench_streaming.py [--sizes 1000 10000 50000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.quiz_generator import QuizGenerator
+
+
+def make_questions(count: int):
+    """构造与 process_questions 输出格式相同的题目列表"""
+    questions = []
+    for i in range(count):
+        if i % 3 == 0:
+            questions.append({'id': i + 1, 'question': f'第{i}题 He ___ to school yesterday.', 'type': '填空题', 'answer': 'went', 'options': []})
+        else:
+            options = [{'label': label, 'text': f'选项内容{label}{i}'} for label in 'ABCD']
+            questions.append({'id': i + 1, 'question': f'第{i}题 下列哪一项是正确的？', 'type': '四选项选择题', 'answer': options[1]['text'], 'options': options})
+    return questions
+
+
+def measure(func):
+    """返回 (峰值内存MB, 耗时秒)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="write_quiz_html 峰值内存测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="题目数量")
+    args = parser.parse_args()
+
+    generator = QuizGenerator()
+    print(f"{'题目数':>8} {'整页峰值(MB)':>14} {'逐段峰值(MB)':>14} {'文件一致':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        whole_path = os.path.join(work_dir, "whole.html")
+        stream_path = os.path.join(work_dir, "stream.html")
+        for count in args.sizes:
+            questions = make_questions(count)
+
+            def write_whole():
+                with open(whole_path, 'w', encoding='utf-8') as f:
+                    f.write(generator.generate_quiz_html(questions, "benchmark"))
+
+            def write_stream():
+                with open(stream_path, 'w', encoding='utf-8') as f:
+                    generator.write_quiz_html(f, questions, "benchmark")
+
+            generator.get_page_fragments()
+            whole_peak, _ = measure(write_whole)
+            stream_peak, _ = measure(write_stream)
+            with open(whole_path, 'rb') as a, open(stream_path, 'rb') as b:
+                identical = a.read() == b.read()
+            print(f"{count:>8} {whole_peak:>14.2f} {stream_peak:>14.2f} {str(identical):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试套件：用合成题库测量各环节的耗时、峰值内存（RSS）和输出大小，保存为 JSON 基线并与已有基线比较
+
+每个用例在独立的子进程中运行，峰值内存互不影响。
+
+用法:
+    python benchmarks/run_suite.py --save benchmarks/baseline.json
+    python benchmarks/run_suite.py --compare benchmarks/baseline.json [--threshold 0.15]
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_workbook, parse_mix
+
+# 用例名称，按执行顺序
+CASES = ('read_excel_file', 'process_questions', 'generate_quiz_html', 'batch_generate_quizzes', 'create_download_zip')
+
+# 比较时判定为回退的指标
+COMPARED_METRICS = ('wall_time', 'peak_rss_mb')
+
+
+def peak_rss_mb() -> float:
+    """当前进程及已结束子进程的峰值内存（MB），不支持的平台返回 0"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOS 以字节为单位，Linux 以 KB 为单位
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _descendant_pids(root: int) -> list:
+    """通过 /proc 列出 root 的全部后代进程"""
+    parents = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'r') as f:
+                # 进程名可能含空格，从最后一个右括号之后开始解析
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        parents.setdefault(int(fields[1]), []).append(int(name))
+    pids, stack = [], [root]
+    while stack:
+        children = parents.get(stack.pop(), [])
+        pids.extend(children)
+        stack.extend(children)
+    return pids
+
+
+def _process_peak_kb(pid: int) -> int:
+    """进程的峰值常驻内存 VmHWM（KB），进程已结束时返回 0"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+class DescendantPeakSampler:
+    """在后台线程中定期采样后代进程的峰值内存
+
+    forkserver 启动的工作进程是 forkserver 的子进程，结束后不会计入本进程的 RUSAGE_CHILDREN，
+    只能在其运行期间读取。仅支持提供 /proc 的平台，其他平台 available 为 False。
+    """
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.available = os.path.isdir('/proc') and os.path.exists(f'/proc/{os.getpid()}/status')
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        for pid in _descendant_pids(os.getpid()):
+            self.peak_kb = max(self.peak_kb, _process_peak_kb(pid))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        if self.available:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_kb / 1024
+
+
+def run_case(case: str, config: dict, work_dir: str) -> dict:
+    """在当前进程中准备并运行一个用例，返回中位耗时、峰值内存和输出大小"""
+    from components.quiz_generator import QuizGenerator
+
+    generator = QuizGenerator()
+    generator.outputs_dir = os.path.join(work_dir, f"outputs_{case}")
+    os.makedirs(generator.outputs_dir, exist_ok=True)
+    excel_files = config['excel_files']
+
+    if case == 'read_excel_file':
+        def step():
+            df = generator.read_excel_file(excel_files[0])
+            return int(df.memory_usage(deep=True).sum())
+    elif case == 'process_questions':
+        df = generator.read_excel_file(excel_files[0])
+
+        def step():
+            return len(json.dumps(generator.process_questions(df.copy()), ensure_ascii=False).encode('utf-8'))
+    elif case == 'generate_quiz_html':
+        questions = generator.process_questions(generator.read_excel_file(excel_files[0]))
+
+        def step():
+            return len(generator.generate_quiz_html(questions, "benchmark").encode('utf-8'))
+    elif case == 'batch_generate_quizzes':
+        def step():
+            results = generator.batch_generate_quizzes(excel_files, max_workers=config['workers'])
+            failed = [result.error for result in results if not result.ok]
+            if failed:
+                raise RuntimeError(failed[0])
+            return sum(result.bytes_written for result in results)
+    elif case == 'create_download_zip':
+        from streamlit_app import StreamlitQuizGeneratorApp, file_stamp
+        app = StreamlitQuizGeneratorApp()
+        app.generator = generator
+        paths = [result.output_path for result in generator.batch_generate_quizzes(excel_files)]
+        # 与 run_generation 记录的导出列表一致：(路径, 包内路径, 文件标记)
+        export_files = [(path, arcname, file_stamp(path)) for path, arcname in app.collect_export_files(paths)]
+
+        def step():
+            return os.path.getsize(app.create_download_zip(export_files))
+    else:
+        raise ValueError(f"未知的用例: {case}")
+
+    times = []
+    output_bytes = 0
+    # 批量生成的工作进程在 forkserver 下是孙进程，需在运行期间采样其峰值内存
+    sampler = DescendantPeakSampler() if case == 'batch_generate_quizzes' else None
+    with sampler or contextlib.nullcontext():
+        for _ in range(config['repeat']):
+            start = time.perf_counter()
+            output_bytes = step()
+            times.append(time.perf_counter() - start)
+    if sampler is None:
+        peak = peak_rss_mb()
+    elif sampler.available:
+        peak = max(peak_rss_mb(), sampler.peak_mb)
+    else:
+        # 无法测量工作进程内存时不记录，比较时跳过该项
+        peak = None
+    return {
+        'wall_time': statistics.median(times),
+        'min_time': min(times),
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+        'output_bytes': output_bytes,
+    }
+
+
+def _case_worker(case: str, config: dict, work_dir: str, queue):
+    try:
+        queue.put(run_case(case, config, work_dir))
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def run_isolated(case: str, config: dict, work_dir: str) -> dict:
+    """在新的子进程中运行用例，避免各用例的峰值内存相互影响"""
+    # 主进程只生成工作簿，不导入 pandas，fork 出的子进程内存基线较小；不支持 fork 的平台使用 spawn
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(method)
+    queue = context.Queue()
+    process = context.Process(target=_case_worker, args=(case, config, work_dir, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """与基线比较，返回超出阈值的回退项说明"""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get('results', {}).get(case)
+        if not previous or 'error' in current or 'error' in previous:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), current.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(f"{case}.{metric}: {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.1f}%)")
+        if previous.get('output_bytes') != current.get('output_bytes'):
+            regressions.append(f"{case}.output_bytes: {previous.get('output_bytes')} -> {current.get('output_bytes')}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="选择题生成器基准测试套件")
+    parser.add_argument("--rows", type=int, default=5000, help="每个合成工作簿的题目数")
+    parser.add_argument("--files", type=int, default=8, help="批量生成与打包使用的工作簿数量")
+    parser.add_argument("--mix", default="4,3,2,1", help="四选项,三选项,填空题,其他选择题 的比例")
+    parser.add_argument("--long-stems", type=float, default=0.1, help="长题干所占比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="批量生成的进程数")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例的重复次数，取中位数")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES), help="要运行的用例")
+    parser.add_argument("--save", help="将结果保存为基线 JSON 文件")
+    parser.add_argument("--compare", help="与已保存的基线 JSON 文件比较")
+    parser.add_argument("--threshold", type=float, default=0.15, help="耗时或内存超出基线的比例阈值")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        excel_files = []
+        for i in range(args.files):
+            path = os.path.join(work_dir, f"bench_{i:03d}.xlsx")
+            make_workbook(path, args.rows, parse_mix(args.mix), args.long_stems, args.seed + i)
+            excel_files.append(path)
+        config = {'excel_files': excel_files, 'workers': args.workers, 'repeat': args.repeat}
+
+        results = {}
+        print(f"{'用例':<24} {'耗时(s)':>9} {'峰值内存(MB)':>13} {'输出字节':>12}")
+        for case in args.cases:
+            result = run_isolated(case, config, work_dir)
+            results[case] = result
+            if 'error' in result:
+                print(f"{case:<24} 失败: {result['error']}")
+            else:
+                peak = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else '-'
+                print(f"{case:<24} {result['wall_time']:>9.3f} {peak:>13} {result['output_bytes']:>12}")
+
+    report = {
+        'config': {key: getattr(args, key) for key in ('rows', 'files', 'mix', 'long_stems', 'seed', 'workers', 'repeat')},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpu_count': os.cpu_count()},
+        'results': results,
+    }
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已保存到 {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print("⚠️ 基线的测试参数与本次不同，比较结果仅供参考")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("❌ 发现性能回退:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ 未发现超出阈值的回退")
+
+
+if __name__ == "__main__":
+    main()
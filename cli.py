@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+坦克云课堂选择题生成器 - 命令行批量编译
+不启动网页界面，将一组Excel题库生成为HTML测试页面，适合定时任务
+
+用法:
+    python cli.py "题库/**/*.xlsx" -o outputs/generated_quizzes --workers 4 --incremental --summary summary.json
+    python cli.py 题库/ --watch          # 持续监视，只重新生成有变化的工作簿
+
+退出码: 0 全部成功，1 有文件处理失败，2 参数错误或没有找到工作簿
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from components.bulk_compiler import collect_excel_files, BulkCompiler, STATUS_FAILED, STATUS_SKIPPED
+from components.precompress import Precompressor
+from components.watcher import WorkbookWatcher
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="将Excel题库批量生成为HTML测试页面（不启动网页界面）")
+    parser.add_argument("inputs", nargs="+", help="工作簿路径、目录或通配符（支持 **），通配符需加引号")
+    parser.add_argument("-o", "--output-dir", default=os.path.join("outputs", "generated_quizzes"), help="输出目录")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument("--watermark", default="坦克云课堂", help="水印文字")
+    parser.add_argument("--incremental", action="store_true",
+                        help="跳过内容、模板和设置都未变化的文件（清单保存在输出目录中）")
+    parser.add_argument("--summary", help="将JSON汇总写入文件，为 - 时输出到标准输出")
+    parser.add_argument("--payload-format", choices=("json", "compact"), default="json", help="题目数据嵌入格式")
+    parser.add_argument("--question-markup", choices=("prerendered", "lazy"), default="prerendered",
+                        help="题目结构生成方式")
+    parser.add_argument("--asset-mode", choices=("inline", "external"), default="inline", help="静态资源方式")
+    parser.add_argument("--minify", action="store_true", help="压缩输出的页面、样式和脚本")
+    parser.add_argument("--precompress", action="store_true",
+                        help="在每个输出文件旁生成 .gz（安装 brotli 时还有 .br）预压缩副本，内容未变化的文件跳过")
+    parser.add_argument("--stream-chunk-size", type=int, default=0, help="大于 0 时逐块读取工作簿，每块的行数")
+    parser.add_argument("--watch", action="store_true",
+                        help="持续监视输入和模板目录，只重新生成有变化的工作簿（模板变化时重新生成全部），按 Ctrl+C 停止")
+    parser.add_argument("--interval", type=float, default=1.0, help="监视模式的轮询间隔（秒）")
+    parser.add_argument("--debounce", type=float, default=2.0, help="监视模式下最后一次变化后等待的静默时间（秒）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出逐个文件的进度")
+    return parser
+
+
+def create_generator(args: argparse.Namespace):
+    """按命令行参数创建生成器"""
+    # 生成器依赖 pandas，解析参数后再导入，--help 与参数错误时无需等待
+    from components.quiz_generator import QuizGenerator
+
+    generator = QuizGenerator()
+    generator.outputs_dir = os.path.abspath(args.output_dir)
+    os.makedirs(generator.outputs_dir, exist_ok=True)
+    generator.payload_format = args.payload_format
+    generator.question_markup = args.question_markup
+    generator.asset_mode = args.asset_mode
+    generator.minify = args.minify
+    if args.precompress:
+        generator.precompressor = Precompressor(max_workers=max(1, args.workers))
+    generator.stream_chunk_size = args.stream_chunk_size
+    return generator
+
+
+def print_record(excel_file: str, record: dict):
+    """输出单个文件的处理结果（标准错误），不影响标准输出中的JSON汇总"""
+    name = os.path.basename(excel_file)
+    if record['status'] == STATUS_FAILED:
+        print(f"❌ {name}: {record['error']}", file=sys.stderr)
+    elif record['status'] == STATUS_SKIPPED:
+        print(f"⏭️  {name}: 未变化，已跳过", file=sys.stderr)
+    else:
+        print(f"✅ {name}: {record['question_count']} 道题目，{record['total_time']:.3f} 秒", file=sys.stderr)
+
+
+def print_summary(summary: dict):
+    """输出一批文件的统计（标准错误）"""
+    print(f"共 {summary['total']} 个文件: 生成 {summary['generated']} 个，跳过 {summary['skipped']} 个，"
+          f"失败 {summary['failed']} 个，{summary['questions']} 道题目，耗时 {summary['elapsed']:.2f} 秒",
+          file=sys.stderr)
+
+
+def write_summary(summary: dict, target: str):
+    """写出JSON汇总，target 为 - 时输出到标准输出"""
+    if target == "-":
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    excel_files = [] if args.watch else collect_excel_files(args.inputs)
+    if not args.watch and not excel_files:
+        print("❌ 没有找到Excel文件", file=sys.stderr)
+        return 2
+
+    on_result = None if args.quiet else print_record
+    compiler = BulkCompiler(create_generator(args), max_workers=max(1, args.workers), incremental=args.incremental)
+
+    if args.watch:
+        def on_batch(summary: dict):
+            print_summary(summary)
+            if args.summary:
+                write_summary(summary, args.summary)
+
+        watcher = WorkbookWatcher(compiler, args.inputs, args.watermark, args.interval, args.debounce)
+        print(f"👀 正在监视 {', '.join(args.inputs)} 和 {watcher.templates_dir}，按 Ctrl+C 停止", file=sys.stderr)
+        try:
+            watcher.run(on_result=on_result, on_batch=on_batch)
+        except KeyboardInterrupt:
+            print("\n👋 已停止监视", file=sys.stderr)
+        return 0
+
+    summary = compiler.compile(excel_files, args.watermark, on_result=on_result)
+    print_summary(summary)
+    if args.summary:
+        write_summary(summary, args.summary)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Optional
+
+
+def file_sha256(file_path: str) -> str:
+    """计算文件内容的 SHA-256 哈希"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """基于内容哈希的持久化构建缓存，按总大小进行LRU淘汰"""
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024, suffix: str = ".html"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # 缓存内容文件的扩展名
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _paths(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}"), os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """查找缓存，命中时返回元数据及缓存文件路径"""
+        html_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            # 更新访问时间，作为LRU淘汰依据
+            os.utime(html_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        metadata['path'] = html_path
+        return metadata
+    
+    def put(self, key: str, source_path: str, metadata: Dict[str, Any], move: bool = False):
+        """将生成的文件及其元数据存入缓存并返回缓存文件路径，move 为 True 时直接移动源文件（需与缓存目录位于同一文件系统）"""
+        html_path, meta_path = self._paths(key)
+        # 先写临时文件再替换，避免并行进程或线程读到不完整的缓存
+        temp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if move:
+            os.replace(source_path, html_path)
+        else:
+            shutil.copyfile(source_path, html_path + temp_suffix)
+            os.replace(html_path + temp_suffix, html_path)
+        with open(meta_path + temp_suffix, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        os.replace(meta_path + temp_suffix, meta_path)
+        self.evict()
+        return html_path
+    
+    def evict(self):
+        """缓存总大小超出上限时，按最近访问时间从旧到新删除条目"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # 并行进程同时淘汰时条目可能已被删除
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.name[:-len(self.suffix)]))
+                total += stat.st_size
+        
+        entries.sort()
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+    
+    def stats(self) -> Dict[str, int]:
+        """返回缓存命中统计"""
+        return {'hits': self.hits, 'misses': self.misses}
+    
+    def clear(self):
+        """清空缓存目录"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                os.remove(entry.path)
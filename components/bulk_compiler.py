@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from components.build_cache import file_sha256
+
+if TYPE_CHECKING:
+    from components.generation_result import GenerationResult
+    from components.quiz_generator import QuizGenerator
+
+# 增量编译清单的文件名，保存在输出目录中
+MANIFEST_NAME = ".quiz_manifest.json"
+
+# 清单格式版本，结构变化时递增
+MANIFEST_VERSION = 1
+
+# 目录作为输入时收集的工作簿扩展名
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+# 文件状态
+STATUS_GENERATED = "generated"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+def collect_excel_files(patterns: List[str]) -> List[str]:
+    """展开通配符（支持 **）和目录，返回去重后按路径排序的工作簿列表"""
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and path.lower().endswith(EXCEL_EXTENSIONS) \
+                    and not os.path.basename(path).startswith('~$'):
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+class BulkCompiler:
+    """无界面批量编译：并行生成一组工作簿到输出目录，增量模式下跳过内容、模板和设置都未变化的文件
+
+    增量模式在输出目录中保存清单，记录每个输出文件对应的源文件状态和构建键（QuizGenerator.get_build_cache_key）。
+    源文件大小和修改时间未变时直接使用清单中的内容哈希，无需重新读取文件。
+    """
+
+    def __init__(self, generator: "QuizGenerator", max_workers: int = 1, incremental: bool = False):
+        self.generator = generator
+        self.max_workers = max_workers
+        # 是否跳过未变化的文件
+        self.incremental = incremental
+        self.manifest_path = os.path.join(generator.outputs_dir, MANIFEST_NAME)
+
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """读取清单，不存在或格式不符时返回空清单"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('entries', {})
+
+    def save_manifest(self, entries: Dict[str, Dict[str, Any]]):
+        """先写临时文件再替换，中断时不会留下不完整的清单"""
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def _content_hash(self, excel_file: str, stat: os.stat_result, entry: Optional[Dict[str, Any]]) -> str:
+        if entry is not None and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['content_hash']
+        return file_sha256(excel_file)
+
+    def compile(self, excel_files: List[str], watermark: str = "坦克云课堂",
+                on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """生成全部工作簿并返回可JSON序列化的汇总；on_result(源文件, 文件记录) 在每个文件完成或跳过时调用"""
+        start = time.perf_counter()
+        manifest = self.load_manifest() if self.incremental else {}
+        records: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        pending_entries: Dict[str, Dict[str, Any]] = {}
+        outputs: Dict[str, str] = {}
+        skipped_outputs: List[str] = []
+
+        def finish(excel_file: str, record: Dict[str, Any]):
+            records[excel_file] = record
+            if on_result is not None:
+                on_result(excel_file, record)
+
+        for excel_file in excel_files:
+            output_name = f"{os.path.splitext(os.path.basename(excel_file))[0]}.html"
+            output_path = os.path.join(self.generator.outputs_dir, output_name)
+            if output_name in outputs:
+                finish(excel_file, {'excel_file': excel_file, 'output_path': None, 'status': STATUS_FAILED,
+                                    'error': f"输出文件名与 {outputs[output_name]} 重复: {output_name}"})
+                continue
+            outputs[output_name] = excel_file
+
+            try:
+                stat = os.stat(excel_file)
+                entry = manifest.get(output_name)
+                content_hash = self._content_hash(excel_file, stat, entry)
+                key = self.generator.get_build_cache_key(excel_file, watermark, content_hash)
+            except Exception as e:
+                finish(excel_file, {'excel_file': excel_file, 'output_path': None, 'status': STATUS_FAILED,
+                                    'error': f"读取文件 {excel_file} 失败: {str(e)}"})
+                continue
+
+            new_entry = {'source': excel_file, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                         'content_hash': content_hash, 'key': key}
+            if entry is not None and entry.get('key') == key and entry.get('source') == excel_file \
+                    and os.path.exists(output_path):
+                # 内容、模板与设置都未变化，沿用已有的输出文件
+                new_entry['question_count'] = entry.get('question_count', 0)
+                manifest[output_name] = new_entry
+                skipped_outputs.append(output_path)
+                finish(excel_file, {'excel_file': excel_file, 'output_path': output_path, 'status': STATUS_SKIPPED,
+                                    'question_count': new_entry['question_count']})
+                continue
+            pending.append(excel_file)
+            pending_entries[excel_file] = dict(new_entry, output_name=output_name)
+
+        def record_result(index: int, result: "GenerationResult"):
+            record = result.to_dict()
+            record['status'] = STATUS_GENERATED if result.ok else STATUS_FAILED
+            finish(pending[index], record)
+
+        if pending:
+            results = self.generator.batch_generate_quizzes(pending, watermark, max_workers=self.max_workers,
+                                                            on_result=record_result)
+            for excel_file, result in zip(pending, results):
+                entry = pending_entries[excel_file]
+                output_name = entry.pop('output_name')
+                if result.ok:
+                    entry['question_count'] = result.question_count
+                    manifest[output_name] = entry
+                else:
+                    manifest.pop(output_name, None)
+
+        if skipped_outputs and self.generator.precompressor is not None:
+            # 跳过的文件补齐缺少或过期的预压缩副本（已同步的只检查修改时间）
+            self.generator.precompressor.compress_files(skipped_outputs)
+
+        if self.incremental:
+            self.save_manifest(manifest)
+
+        files = [records[excel_file] for excel_file in excel_files]
+        counts = {status: sum(1 for record in files if record['status'] == status)
+                  for status in (STATUS_GENERATED, STATUS_SKIPPED, STATUS_FAILED)}
+        return {
+            'output_dir': os.path.abspath(self.generator.outputs_dir),
+            'total': len(files),
+            'generated': counts[STATUS_GENERATED],
+            'skipped': counts[STATUS_SKIPPED],
+            'failed': counts[STATUS_FAILED],
+            'questions': sum(record.get('question_count', 0) for record in files if record['status'] != STATUS_FAILED),
+            'elapsed': time.perf_counter() - start,
+            'files': files,
+        }
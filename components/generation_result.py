@@ -0,0 +1,56 @@
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+# 命中构建缓存时追加在结果消息末尾的说明
+BUILD_CACHE_HIT_NOTE = "（命中构建缓存）"
+
+
+@dataclass
+class GenerationResult:
+    """单个Excel文件的生成结果，包含题目统计与各阶段耗时（秒）"""
+
+    excel_file: str
+    output_path: Optional[str] = None
+    question_count: int = 0
+    # 各题型的题目数量
+    type_counts: Dict[str, int] = field(default_factory=dict)
+    # 输出HTML文件的字节数
+    bytes_written: int = 0
+    # 读取Excel、标准化题目、渲染写出页面的耗时
+    parse_time: float = 0.0
+    normalize_time: float = 0.0
+    render_time: float = 0.0
+    # 是否直接使用了构建缓存中的结果
+    cached: bool = False
+    cancelled: bool = False
+    error: Optional[str] = None
+    # 启用性能采集时的各阶段耗时与计数（FileMetrics.as_dict()）
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """是否生成成功"""
+        return self.error is None and self.output_path is not None
+
+    @property
+    def total_time(self) -> float:
+        """各阶段耗时之和"""
+        return self.parse_time + self.normalize_time + self.render_time
+
+    @property
+    def message(self) -> str:
+        """可读的结果说明"""
+        if not self.ok:
+            return self.error or f"处理文件 {self.excel_file} 失败"
+        output_filename = os.path.basename(self.output_path)
+        if self.cached:
+            return f"成功生成测试文件: {output_filename}\n包含 {self.question_count} 道题目{BUILD_CACHE_HIT_NOTE}"
+        return f"成功生成测试文件: {output_filename}\n包含 {self.question_count} 道题目\n解析耗时 {self.parse_time:.3f} 秒"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为可JSON序列化的字典，供报告和监控使用"""
+        data = asdict(self)
+        data['ok'] = self.ok
+        data['total_time'] = self.total_time
+        return data
@@ -0,0 +1,267 @@
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 可选的批量性能采集方式
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+# 可复用的空上下文，关闭采集时阶段计时不产生额外对象
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class FileMetrics:
+    """单个文件生成过程中各阶段的耗时（秒）与计数
+
+    阶段: read_excel、process_questions、questions_html、javascript、write、precompress（启用预压缩时）；计数: rows、questions、bytes
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """统计代码块的耗时，同名阶段累加"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float):
+        """累加阶段耗时"""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        """累加计数"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def timed_iter(self, name: str, iterable: Iterable[str]) -> Iterator[str]:
+        """逐段生成时只统计产生每一段所用的时间，不包括调用方处理的时间"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - start)
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield chunk
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'timings': dict(self.timings), 'counters': dict(self.counters)}
+
+
+class _NullMetrics(FileMetrics):
+    """关闭采集时使用的空实现，各方法不做任何事"""
+
+    def stage(self, name: str):
+        return _NULL_CONTEXT
+
+    def add_time(self, name: str, seconds: float):
+        pass
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def timed_iter(self, name: str, iterable: Iterable[str]) -> Iterable[str]:
+        return iterable
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {}
+
+
+NULL_METRICS = _NullMetrics()
+
+
+class LoggingSink:
+    """将采集记录以JSON格式写入日志"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("quiz_generator.metrics")
+        self.level = level
+
+    def emit(self, record: Dict[str, Any]):
+        self.logger.log(self.level, json.dumps(record, ensure_ascii=False))
+
+
+class JsonLinesSink:
+    """将采集记录逐行追加到 JSON Lines 文件"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class PrometheusTextSink:
+    """累计各阶段耗时与计数，以 Prometheus 文本格式写出（供 node_exporter textfile 采集）"""
+
+    def __init__(self, path: str, prefix: str = "quiz_generator"):
+        self.path = path
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.files = {'ok': 0, 'failed': 0, 'cached': 0, 'cancelled': 0}
+        self.stage_seconds: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.batches = 0
+        self.batch_seconds = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, record: Dict[str, Any]):
+        with self._lock:
+            if record.get('event') == 'batch':
+                self.batches += 1
+                self.batch_seconds += record.get('elapsed', 0.0)
+            else:
+                # 已取消的文件带有错误信息，需先于失败判断
+                if record.get('cached'):
+                    status = 'cached'
+                elif record.get('ok'):
+                    status = 'ok'
+                elif record.get('cancelled'):
+                    status = 'cancelled'
+                else:
+                    status = 'failed'
+                self.files[status] += 1
+                for name, seconds in record.get('timings', {}).items():
+                    self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+                for name, value in record.get('counters', {}).items():
+                    self.counters[name] = self.counters.get(name, 0) + value
+            self._write()
+
+    def render(self) -> str:
+        """当前累计值的文本格式"""
+        p = self.prefix
+        lines = [f"# HELP {p}_files_total 已处理的文件数", f"# TYPE {p}_files_total counter"]
+        lines += [f'{p}_files_total{{status="{status}"}} {value}' for status, value in self.files.items()]
+        lines += [f"# HELP {p}_stage_seconds_total 各阶段累计耗时", f"# TYPE {p}_stage_seconds_total counter"]
+        lines += [f'{p}_stage_seconds_total{{stage="{name}"}} {value:.6f}' for name, value in sorted(self.stage_seconds.items())]
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {value}"]
+        lines += [f"# TYPE {p}_batches_total counter", f"{p}_batches_total {self.batches}",
+                  f"# TYPE {p}_batch_seconds_total counter", f"{p}_batch_seconds_total {self.batch_seconds:.6f}"]
+        return "\n".join(lines) + "\n"
+
+    def _write(self):
+        # 先写临时文件再替换，采集端不会读到不完整的内容
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, self.path)
+
+
+class Instrumentation:
+    """可选的性能采集：按文件记录各阶段耗时与计数并写入各个输出端，可按批次采集 cProfile/tracemalloc 报告
+
+    未设置到 QuizGenerator.instrumentation 时不做任何采集。
+    """
+
+    def __init__(self, sinks: Optional[List[Any]] = None, profile: Optional[str] = None,
+                 profile_dir: Optional[str] = None, profile_top: int = 30):
+        if profile is not None and profile not in PROFILE_MODES:
+            raise ValueError(f"不支持的采集方式: {profile}")
+        # 输出端，需提供 emit(record) 方法
+        self.sinks = list(sinks or [])
+        # 批量性能采集方式: None、"cprofile" 或 "tracemalloc"
+        self.profile = profile
+        self.profile_dir = profile_dir or os.path.join(os.getcwd(), "profiles")
+        self.profile_top = profile_top
+        # 最近一次批量采集生成的报告文件
+        self.last_reports: List[str] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 进程池子进程只负责采集，记录由主进程写入输出端，因此不传递输出端
+        state = self.__dict__.copy()
+        state['sinks'] = []
+        return state
+
+    def new_metrics(self) -> FileMetrics:
+        """为一个文件创建新的采集记录"""
+        return FileMetrics()
+
+    def emit(self, record: Dict[str, Any]):
+        """将记录写入所有输出端"""
+        record.setdefault('timestamp', time.time())
+        for sink in self.sinks:
+            sink.emit(record)
+
+    def emit_result(self, result: Any):
+        """写入单个文件的生成结果（GenerationResult）"""
+        record = {
+            'event': 'file',
+            'file': os.path.basename(result.excel_file),
+            'ok': result.ok,
+            'cached': result.cached,
+            'cancelled': result.cancelled,
+            'error': result.error,
+        }
+        record.update(result.metrics)
+        self.emit(record)
+
+    def emit_batch(self, results: List[Any], elapsed: float):
+        """写入一个批次中各文件的结果及批次汇总"""
+        for result in results:
+            self.emit_result(result)
+        self.emit({
+            'event': 'batch',
+            'files': len(results),
+            'failed': sum(1 for result in results if not result.ok and not result.cancelled),
+            'cancelled': sum(1 for result in results if result.cancelled),
+            'elapsed': elapsed,
+        })
+
+    @contextlib.contextmanager
+    def profile_batch(self, label: str = "batch") -> Iterator[None]:
+        """在批次执行期间采集 cProfile 或 tracemalloc 数据，结束后写出报告"""
+        if self.profile is None:
+            yield
+            return
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stem = os.path.join(self.profile_dir, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        self.last_reports = []
+        if self.profile == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                profiler.dump_stats(f"{stem}.prof")
+                report = io.StringIO()
+                pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(self.profile_top)
+                with open(f"{stem}.txt", 'w', encoding='utf-8') as f:
+                    f.write(report.getvalue())
+                self.last_reports = [f"{stem}.prof", f"{stem}.txt"]
+        else:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                if started:
+                    tracemalloc.stop()
+                with open(f"{stem}-memory.txt", 'w', encoding='utf-8') as f:
+                    f.write(f"当前内存: {current / 1024 / 1024:.2f} MB\n峰值内存: {peak / 1024 / 1024:.2f} MB\n\n")
+                    for stat in snapshot.statistics('lineno')[:self.profile_top]:
+                        f.write(f"{stat}\n")
+                self.last_reports = [f"{stem}-memory.txt"]
@@ -0,0 +1,131 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+
+# 已结束的任务状态
+FINISHED_STATES = (JOB_DONE, JOB_CANCELLED, JOB_FAILED)
+
+
+class Job:
+    """后台任务：记录进度、逐个文件的结果与最终输出，可以取消"""
+
+    def __init__(self, total: int, key: Optional[Hashable] = None):
+        self.job_id = uuid.uuid4().hex[:12]
+        # 相同 key 的任务可以复用
+        self.key = key
+        self.total = total
+        self.status = JOB_QUEUED
+        self.completed = 0
+        self.questions = 0
+        # 任务函数的返回值
+        self.output: Any = None
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._results: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        """已完成文件的比例"""
+        return self.completed / self.total if self.total else 1.0
+
+    def record(self, index: int, result: Any):
+        """记录一个文件的结果（GenerationResult），可从任意线程调用"""
+        with self._lock:
+            self._results[index] = result
+            self.completed = len(self._results)
+            self.questions += getattr(result, 'question_count', 0)
+
+    def results(self) -> List[Any]:
+        """按文件序号排列的已完成结果"""
+        with self._lock:
+            return [self._results[index] for index in sorted(self._results)]
+
+    def cancel(self):
+        """请求取消，尚未开始的文件不再处理"""
+        self.cancel_event.set()
+
+
+class JobQueue:
+    """进程内的后台任务队列：固定数量的工作线程依次执行任务，已结束的任务按数量上限和有效期淘汰"""
+
+    def __init__(self, max_workers: int = 2, max_finished: int = 50, ttl: float = 3600):
+        self.max_finished = max_finished
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quiz-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[Job], Any], total: int, key: Optional[Hashable] = None,
+               reuse: Optional[Callable[[Job], bool]] = None) -> Job:
+        """提交任务，func(job) 的返回值保存为 job.output
+
+        指定 key 时，若已有相同 key、未失败或取消且 reuse(job) 为真的任务，直接返回该任务。
+        """
+        with self._lock:
+            self._evict()
+            if key is not None:
+                for job in self._jobs.values():
+                    if job.key == key and job.status not in (JOB_CANCELLED, JOB_FAILED) \
+                            and (reuse is None or not job.finished or reuse(job)):
+                        return job
+            job = Job(total, key)
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func: Callable[[Job], Any]):
+        if job.cancel_event.is_set():
+            status = JOB_CANCELLED
+        else:
+            job.status = JOB_RUNNING
+            try:
+                job.output = func(job)
+                status = JOB_CANCELLED if job.cancel_event.is_set() else JOB_DONE
+            except Exception as e:
+                job.error = str(e)
+                status = JOB_FAILED
+        # 先记录结束时间再更新状态，其他线程看到已结束时结束时间一定存在
+        job.finished_at = time.time()
+        job.status = status
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """按任务ID查找任务"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """取消任务，任务不存在时返回 False"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def jobs(self) -> List[Job]:
+        """全部任务，按提交时间排列"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def _evict(self):
+        """删除超过有效期或超出数量上限的已结束任务"""
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if job.finished), key=lambda job: job.finished_at)
+        for index, job in enumerate(finished):
+            if now - job.finished_at > self.ttl or index < len(finished) - self.max_finished:
+                del self._jobs[job.job_id]
@@ -0,0 +1,203 @@
+import re
+from typing import List
+
+# 压缩时保持原样的HTML元素（内容中的空白有意义或另行压缩）
+_RAW_BLOCK_PATTERN = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_HTML_COMMENT_PATTERN = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_LINE_BREAK_PATTERN = re.compile(r'\n\s*')
+_TRAILING_SPACE_PATTERN = re.compile(r'[ \t\r\f\v]+\n')
+_SPACES_PATTERN = re.compile(r'[ \t\r\f\v]{2,}')
+
+_CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_PATTERN = re.compile(r'\s+')
+_CSS_PUNCTUATION_PATTERN = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_PATTERN = re.compile(r':\s+')
+
+# 紧邻这些字符的空格可以安全去除
+_JS_TIGHT_CHARS = set('{}()[];,:=<>&|?!')
+# 行末为这些字符时，去掉其后的换行不会改变自动分号插入的结果
+_JS_JOIN_AFTER = set('{;,([')
+_JS_JOIN_BEFORE = set('})]')
+# 出现在这些字符之后的 / 为正则表达式开头，而不是除号
+_JS_REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield', 'await')
+
+
+def minify_css(css: str) -> str:
+    """去除注释和多余空白"""
+    css = _CSS_COMMENT_PATTERN.sub('', css)
+    css = _CSS_SPACE_PATTERN.sub(' ', css)
+    css = _CSS_PUNCTUATION_PATTERN.sub(r'\1', css)
+    # 只去除冒号之后的空格，冒号之前的空格在选择器中有意义（如 "a :hover"）
+    css = _CSS_COLON_PATTERN.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def _skip_string(source: str, start: int) -> int:
+    """返回以 source[start] 开头的字符串字面量之后的位置"""
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == quote or char == '\n':
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_template(source: str, start: int) -> int:
+    """返回以 source[start] 开头的模板字符串之后的位置，${} 中可以嵌套字符串与模板字符串"""
+    i = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+        elif char == '`':
+            return i + 1
+        elif source.startswith('${', i):
+            depth = 1
+            i += 2
+            while i < len(source) and depth:
+                char = source[i]
+                if char in '\'"':
+                    i = _skip_string(source, i)
+                    continue
+                if char == '`':
+                    i = _skip_template(source, i)
+                    continue
+                if char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                i += 1
+        else:
+            i += 1
+    return i
+
+
+def _skip_regex(source: str, start: int) -> int:
+    """返回以 source[start] 开头的正则表达式字面量（含标志）之后的位置"""
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '\n':
+            return i
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _regex_allowed(out: List[str]) -> bool:
+    """根据已输出的内容判断下一个 / 是否开始正则表达式"""
+    text = ''.join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in _JS_REGEX_PREFIX:
+        return True
+    return any(text.endswith(keyword) and (len(text) == len(keyword) or not (text[-len(keyword) - 1].isalnum() or text[-len(keyword) - 1] in '_$'))
+               for keyword in _JS_REGEX_KEYWORDS)
+
+
+def minify_js(source: str) -> str:
+    """保守的JavaScript压缩：去除注释、缩进、空行和标点两侧的空格
+
+    字符串、模板字符串和正则表达式保持原样；只在不影响自动分号插入的位置合并行。
+    """
+    out: List[str] = []
+    i = 0
+    pending_space = False
+    pending_newline = False
+    length = len(source)
+
+    def last_char() -> str:
+        return out[-1][-1] if out else ''
+
+    def flush(next_char: str):
+        nonlocal pending_space, pending_newline
+        previous = last_char()
+        if pending_newline and previous and previous not in _JS_JOIN_AFTER and next_char not in _JS_JOIN_BEFORE:
+            out.append('\n')
+        elif (pending_space or pending_newline) and previous \
+                and previous not in _JS_TIGHT_CHARS and next_char not in _JS_TIGHT_CHARS:
+            out.append(' ')
+        pending_space = pending_newline = False
+
+    while i < length:
+        char = source[i]
+        if char in ' \t\r\f\v':
+            pending_space = True
+            i += 1
+        elif char == '\n':
+            pending_newline = True
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = length if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = length if end < 0 else end + 2
+            pending_space = True
+        elif char in '\'"`' or (char == '/' and _regex_allowed(out)):
+            flush(char)
+            if char == '`':
+                end = _skip_template(source, i)
+            elif char == '/':
+                end = _skip_regex(source, i)
+            else:
+                end = _skip_string(source, i)
+            out.append(source[i:end])
+            i = end
+        else:
+            flush(char)
+            start = i
+            while i < length and source[i] not in ' \t\r\f\v\n\'"`/':
+                i += 1
+            if i == start:
+                # 除号
+                i += 1
+            out.append(source[start:i])
+    return ''.join(out)
+
+
+def minify_html(html: str) -> str:
+    """去除HTML注释、缩进和多余空白；内嵌脚本与样式分别压缩，pre/textarea 保持原样"""
+    parts = []
+    position = 0
+    for match in _RAW_BLOCK_PATTERN.finditer(html):
+        parts.append(_minify_markup(html[position:match.start()]))
+        open_tag, tag, content, close_tag = match.group(1), match.group(2).lower(), match.group(3), match.group(4)
+        if tag == 'script' and 'src=' not in open_tag.lower():
+            content = minify_js(content)
+        elif tag == 'style':
+            content = minify_css(content)
+        parts.append(open_tag + content + close_tag)
+        position = match.end()
+    parts.append(_minify_markup(html[position:]))
+    return ''.join(parts)
+
+
+def _minify_markup(markup: str) -> str:
+    # 每道题目都会调用，先用子串判断跳过不需要的替换
+    if '<!--' in markup:
+        markup = _HTML_COMMENT_PATTERN.sub('', markup)
+    markup = _LINE_BREAK_PATTERN.sub('\n', markup)
+    if ' \n' in markup or '\t\n' in markup or '\r\n' in markup:
+        markup = _TRAILING_SPACE_PATTERN.sub('\n', markup)
+    if '  ' in markup or '\t' in markup:
+        markup = _SPACES_PATTERN.sub(' ', markup)
+    return markup
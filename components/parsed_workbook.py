@@ -0,0 +1,87 @@
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import pandas as pd
+
+from components.build_cache import file_sha256
+
+if TYPE_CHECKING:
+    from components.quiz_generator import QuizGenerator
+
+
+class ParsedWorkbook:
+    """解析一次、多处复用的工作簿：预览、统计与生成共用同一份读取结果"""
+    
+    def __init__(self, generator: "QuizGenerator", file_path: str, content_hash: Optional[str] = None):
+        # generator 只用于读取和标准化题目
+        self.generator = generator
+        self.file_path = file_path
+        self.name = os.path.basename(file_path)
+        self.content_hash = content_hash or file_sha256(file_path)
+        self.parse_time = 0.0
+        self.normalize_time = 0.0
+        self._header: Optional[List[str]] = None
+        self._row_count: Optional[int] = None
+        self._previews: Dict[int, pd.DataFrame] = {}
+        self._dataframe: Optional[pd.DataFrame] = None
+        self._questions: Optional[List[Dict[str, Any]]] = None
+    
+    @property
+    def is_loaded(self) -> bool:
+        """题目是否已经完整读取并标准化"""
+        return self._questions is not None
+    
+    def header(self) -> List[str]:
+        """表头列名（只读取第一行）"""
+        if self._header is None:
+            self._header = self.generator.read_excel_header(self.file_path)
+        return self._header
+    
+    def missing_columns(self) -> List[str]:
+        """缺少的必需列"""
+        from components.quiz_generator import REQUIRED_COLUMNS
+        header = self.header()
+        return [col for col in REQUIRED_COLUMNS if col not in header]
+    
+    def row_count(self) -> int:
+        """数据行数，已完整读取时直接使用读取结果"""
+        if self._dataframe is not None:
+            return len(self._dataframe)
+        if self._row_count is None:
+            self._row_count = self.generator.count_excel_rows(self.file_path)
+        return self._row_count
+    
+    def preview(self, rows: int = 5) -> pd.DataFrame:
+        """前若干行必需列的数据，已完整读取时直接截取"""
+        if self._dataframe is not None:
+            return self._dataframe.head(rows)
+        if rows not in self._previews:
+            self._previews[rows] = self.generator.read_excel_preview(self.file_path, rows)
+        return self._previews[rows]
+    
+    def dataframe(self) -> pd.DataFrame:
+        """完整读取的必需列数据"""
+        if self._dataframe is None:
+            start = time.perf_counter()
+            self._dataframe = self.generator.read_excel_file(self.file_path)
+            self.parse_time = time.perf_counter() - start
+        return self._dataframe
+    
+    def questions(self) -> List[Dict[str, Any]]:
+        """标准化后的题目列表"""
+        if self._questions is None:
+            df = self.dataframe().copy()
+            start = time.perf_counter()
+            self._questions = self.generator.process_questions(df)
+            self.normalize_time = time.perf_counter() - start
+        return self._questions
+    
+    def statistics(self) -> Dict[str, Any]:
+        """题目统计信息"""
+        questions = self.questions()
+        return {
+            'total_questions': len(questions),
+            'question_types': self.generator.count_question_types(questions),
+            'file_name': self.name
+        }
@@ -0,0 +1,147 @@
+import json
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 题目数据暂存在内存中的上限，超出后写入临时文件
+DEFAULT_SPOOL_SIZE = 4 * 1024 * 1024
+
+
+def compact_question(question: Dict[str, Any], type_indexes: Dict[str, int], types: List[str]) -> Tuple[str, int, Any, List[str], Any, Optional[str]]:
+    """将单道题目编码为紧凑格式的各列取值：(题干, 类型下标, 答案, 选项内容, 评分索引, 非默认的选项标签)
+
+    评分索引对选择题为正确选项下标，对填空题为可接受的答案列表；题目中没有时按答案计算。
+    """
+    q_type = question['type']
+    if q_type not in type_indexes:
+        type_indexes[q_type] = len(types)
+        types.append(q_type)
+    
+    texts = [option['text'] for option in question['options']]
+    labels = ''.join(option['label'] for option in question['options'])
+    
+    # 答案与某个选项内容相同时只记录其下标
+    answer = question['answer']
+    answer = texts.index(answer) if answer in texts else answer
+    
+    if 'accepted' in question:
+        grading = question['accepted']
+    elif 'correct' in question:
+        grading = question['correct']
+    else:
+        from components.quiz_generator import grading_index
+        grading = next(iter(grading_index(question).values()))
+    
+    # 仅记录不是从 A 开始连续排列的选项标签
+    custom_labels = labels if labels != 'ABCD'[:len(labels)] else None
+    return question['question'], type_indexes[q_type], answer, texts, grading, custom_labels
+
+
+def _dumps(value: Any, indent: Optional[int] = None) -> str:
+    if indent is None:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(value, ensure_ascii=False, indent=indent)
+
+
+class _Spool:
+    """以逗号分隔累积JSON数组元素的临时存储"""
+    
+    def __init__(self, spool_size: int):
+        self.file = tempfile.SpooledTemporaryFile(max_size=spool_size, mode='w+', encoding='utf-8')
+        self.empty = True
+    
+    def append(self, text: str):
+        if not self.empty:
+            self.file.write(',')
+        self.file.write(text)
+        self.empty = False
+    
+    def iter_chunks(self, block_size: int = 64 * 1024) -> Iterator[str]:
+        self.file.seek(0)
+        for block in iter(lambda: self.file.read(block_size), ''):
+            yield block
+    
+    def close(self):
+        self.file.close()
+
+
+class PayloadStream:
+    """分批接收题目并暂存编码结果，输出与一次性编码完全相同的题目数据JSON"""
+    
+    def __init__(self, payload_format: str = "json", spool_size: int = DEFAULT_SPOOL_SIZE, indent: Optional[int] = 2):
+        self.payload_format = payload_format
+        # JSON格式的缩进，为 None 时不换行不缩进（压缩输出）
+        self.indent = indent
+        self.count = 0
+        self._spool_size = spool_size
+        self._columns: Dict[str, _Spool] = {}
+        # 紧凑格式的类型表、非默认标签与题号
+        self._types: List[str] = []
+        self._type_indexes: Dict[str, int] = {}
+        self._labels: Dict[str, str] = {}
+        self._first_id: Optional[int] = None
+        self._consecutive_ids = True
+    
+    def _column(self, name: str) -> _Spool:
+        if name not in self._columns:
+            self._columns[name] = _Spool(self._spool_size)
+        return self._columns[name]
+    
+    def add(self, questions: List[Dict[str, Any]]):
+        """追加一批题目"""
+        if not questions:
+            return
+        
+        if self.payload_format != "compact":
+            # JSON数组：去掉整批编码结果首尾的括号后按逗号拼接
+            encoded = _dumps(questions, indent=self.indent)
+            self._column('items').append(encoded[1:-2] if self.indent is not None else encoded[1:-1])
+            self.count += len(questions)
+            return
+        
+        for question in questions:
+            text, type_index, answer, texts, grading, custom_labels = compact_question(question, self._type_indexes, self._types)
+            if custom_labels is not None:
+                self._labels[str(self.count)] = custom_labels
+            if self._first_id is None:
+                self._first_id = question['id']
+            elif question['id'] != self._first_id + self.count:
+                self._consecutive_ids = False
+            self._column('q').append(_dumps(text))
+            self._column('t').append(str(type_index))
+            self._column('a').append(_dumps(answer))
+            self._column('o').append(_dumps(texts))
+            self._column('k').append(_dumps(grading))
+            self._column('ids').append(str(question['id']))
+            self.count += 1
+    
+    def iter_chunks(self) -> Iterator[str]:
+        """按顺序输出完整的题目数据JSON"""
+        if self.payload_format != "compact":
+            if self.count == 0:
+                yield '[]'
+                return
+            yield '['
+            yield from self._columns['items'].iter_chunks()
+            yield '\n]' if self.indent is not None else ']'
+            return
+        
+        yield '{"types":' + _dumps(self._types)
+        for name in ('q', 't', 'a', 'o', 'k'):
+            yield f',"{name}":['
+            if name in self._columns:
+                yield from self._columns[name].iter_chunks()
+            yield ']'
+        yield ',"l":' + _dumps(self._labels)
+        # 题号连续时只记录起始值
+        if self._consecutive_ids:
+            yield f',"id0":{self._first_id if self._first_id is not None else 1}}}'
+        else:
+            yield ',"ids":['
+            yield from self._columns['ids'].iter_chunks()
+            yield ']}'
+    
+    def close(self):
+        """释放暂存文件"""
+        for column in self._columns.values():
+            column.close()
+        self._columns.clear()
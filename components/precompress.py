@@ -0,0 +1,161 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 读取文件时的块大小
+BLOCK_SIZE = 1024 * 1024
+
+# 预压缩副本的扩展名，追加在原文件名之后（quiz.html -> quiz.html.gz）
+GZIP_SUFFIX = '.gz'
+BROTLI_SUFFIX = '.br'
+
+# gzip 头部标志位
+_FHCRC = 0x02
+_FEXTRA = 0x04
+_FNAME = 0x08
+_FCOMMENT = 0x10
+
+
+def available_suffixes() -> Tuple[str, ...]:
+    """当前环境可以生成的预压缩格式；未安装 brotli 时只生成 gzip"""
+    return (GZIP_SUFFIX, BROTLI_SUFFIX) if brotli is not None else (GZIP_SUFFIX,)
+
+
+def read_gzip_member(path: str) -> Optional[Tuple[int, int, int, int]]:
+    """解析单成员 gzip 文件，返回 (deflate 数据偏移, deflate 数据长度, CRC32, 原始大小)；格式不符时返回 None"""
+    with open(path, 'rb') as f:
+        header = f.read(10)
+        if len(header) < 10 or header[:3] != b'\x1f\x8b\x08':
+            return None
+        flags = header[3]
+        if flags & _FEXTRA:
+            extra_length = f.read(2)
+            if len(extra_length) < 2:
+                return None
+            f.seek(struct.unpack('<H', extra_length)[0], os.SEEK_CUR)
+        for flag in (_FNAME, _FCOMMENT):
+            if flags & flag:
+                # 以 0 结尾的文件名或注释
+                while True:
+                    char = f.read(1)
+                    if not char:
+                        return None
+                    if char == b'\0':
+                        break
+        if flags & _FHCRC:
+            f.seek(2, os.SEEK_CUR)
+        offset = f.tell()
+        end = f.seek(0, os.SEEK_END) - 8
+        if end < offset:
+            return None
+        f.seek(end)
+        crc, size = struct.unpack('<II', f.read(8))
+    return offset, end - offset, crc, size
+
+
+def _file_crc32(path: str) -> int:
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+class Precompressor:
+    """在输出文件旁生成预压缩副本（.gz，安装 brotli 时同时生成 .br），静态服务器可直接发送而无需每次请求时压缩
+
+    副本的修改时间与原文件保持一致，据此判断是否需要重新压缩；原文件被重新写入但内容未变时
+    （gzip 副本记录的 CRC32 与大小一致）只同步修改时间，不再压缩。
+    """
+
+    def __init__(self, gzip_level: int = 9, brotli_quality: int = 11, max_workers: Optional[int] = None,
+                 suffixes: Optional[Tuple[str, ...]] = None):
+        if not 1 <= gzip_level <= 9:
+            raise ValueError(f"gzip 压缩级别需在 1 到 9 之间: {gzip_level}")
+        suffixes = tuple(suffixes) if suffixes is not None else available_suffixes()
+        if BROTLI_SUFFIX in suffixes and brotli is None:
+            raise ValueError("生成 .br 文件需要安装 brotli")
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        # 生成的预压缩格式
+        self.suffixes = suffixes
+
+    def sidecar_paths(self, file_path: str) -> List[str]:
+        """文件对应的全部预压缩副本路径"""
+        return [file_path + suffix for suffix in self.suffixes]
+
+    def is_current(self, file_path: str, sidecar_path: str) -> bool:
+        """副本是否与原文件同步（修改时间一致）"""
+        try:
+            return os.stat(sidecar_path).st_mtime_ns == os.stat(file_path).st_mtime_ns
+        except OSError:
+            return False
+
+    def compress_file(self, file_path: str) -> List[str]:
+        """为一个文件生成预压缩副本，返回本次写入的副本路径；都已同步时返回空列表"""
+        stat = os.stat(file_path)
+        pending = [suffix for suffix in self.suffixes if not self.is_current(file_path, file_path + suffix)]
+        if not pending:
+            return []
+
+        gzip_path = file_path + GZIP_SUFFIX
+        if os.path.exists(gzip_path):
+            member = read_gzip_member(gzip_path)
+            if member is not None and member[3] == stat.st_size & 0xFFFFFFFF and member[2] == _file_crc32(file_path):
+                # 内容未变，只同步修改时间；与 gzip 副本同时写入的其他副本同样有效
+                gzip_mtime = os.stat(gzip_path).st_mtime_ns
+                for suffix in list(pending):
+                    sidecar_path = file_path + suffix
+                    if os.path.exists(sidecar_path) and os.stat(sidecar_path).st_mtime_ns == gzip_mtime:
+                        os.utime(sidecar_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                        pending.remove(suffix)
+
+        written = []
+        for suffix in pending:
+            sidecar_path = file_path + suffix
+            # 先写临时文件再替换，静态服务器不会读到不完整的副本
+            temp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+            try:
+                with open(file_path, 'rb') as source, open(temp_path, 'wb') as target:
+                    if suffix == GZIP_SUFFIX:
+                        self._write_gzip(source, target, int(stat.st_mtime))
+                    else:
+                        target.write(brotli.compress(source.read(), quality=self.brotli_quality))
+                os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                os.replace(temp_path, sidecar_path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            written.append(sidecar_path)
+        return written
+
+    def _write_gzip(self, source, target, mtime: int):
+        """写出单成员 gzip：不含文件名的10字节头部、原始 deflate 数据、CRC32 与大小"""
+        target.write(b'\x1f\x8b\x08\x00' + struct.pack('<I', mtime & 0xFFFFFFFF)
+                     + (b'\x02' if self.gzip_level == 9 else b'\x00') + b'\xff')
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, -15)
+        crc = 0
+        size = 0
+        for block in iter(lambda: source.read(BLOCK_SIZE), b''):
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            target.write(compressor.compress(block))
+        target.write(compressor.flush())
+        target.write(struct.pack('<II', crc, size & 0xFFFFFFFF))
+
+    def compress_files(self, file_paths: List[str]) -> List[str]:
+        """并行为多个文件生成预压缩副本，返回本次写入的副本路径"""
+        if self.max_workers <= 1 or len(file_paths) <= 1:
+            return [path for file_path in file_paths for path in self.compress_file(file_path)]
+        # zlib 与 brotli 压缩时释放 GIL，线程即可并行
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [path for written in executor.map(self.compress_file, file_paths) for path in written]
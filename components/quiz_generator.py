@@ -1,8 +1,127 @@
 import pandas as pd
+import numpy as np
 import os
 import random
 import json
-from typing import List, Dict, Any, Tuple
+import re
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+import importlib.util
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Iterable, IO, Union, Callable
+
+from components.template_registry import get_template_registry
+from components.build_cache import BuildCache, file_sha256
+from components.parsed_workbook import ParsedWorkbook
+from components.minify import minify_css, minify_html, minify_js
+from components.precompress import Precompressor
+from components.payload_stream import PayloadStream, compact_question, DEFAULT_SPOOL_SIZE
+from components.generation_result import GenerationResult
+from components.instrumentation import Instrumentation, FileMetrics, NULL_METRICS
+
+# Excel文件必需的列
+REQUIRED_COLUMNS = ['题干', '选项A', '选项B', '选项C', '选项D', '答案']
+
+# 生成结果所依赖的全部模板文件
+TEMPLATE_FILES = ('styles.css', 'header.html', 'footer.html', 'quiz_runtime.js', 'compact_decoder.js', 'lazy_questions.js')
+
+# 构建缓存格式版本，生成逻辑或缓存元数据变化时递增
+BUILD_CACHE_VERSION = 5
+
+# 批量生成的工作进程启动方式：调用方（如 Streamlit 服务）是多线程进程，fork 时其他线程持有的锁会被复制而导致死锁，
+# 因此使用 forkserver（不支持时使用 spawn）；forkserver 预先导入本模块，各工作进程无需重复导入 pandas
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    PROCESS_CONTEXT = multiprocessing.get_context('forkserver')
+    PROCESS_CONTEXT.set_forkserver_preload(['components.quiz_generator'])
+else:
+    PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+# 填空题多个可接受答案之间的分隔符
+ANSWER_VARIANT_PATTERN = re.compile(r'[|｜]')
+
+# 页头模板中的脚本块
+HEADER_SCRIPT_PATTERN = re.compile(r'<script>(.*?)</script>', re.S)
+
+# 追加在模板样式之后的导航与水印样式
+WATERMARK_CSS = """
+        .navigation-container {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-top: 20px;
+        }
+        
+        .nav-buttons {
+            display: flex;
+            gap: 10px;
+        }
+        
+        .watermark {
+            font-size: 12px;
+            color: #666;
+            opacity: 0.5;
+            pointer-events: none;
+            font-family: Arial, sans-serif;
+            margin-right: 10px;
+        }
+        """
+
+def _generate_quiz_chunk(generator: "QuizGenerator", excel_files: List[Union[str, ParsedWorkbook]], watermark: str) -> List[GenerationResult]:
+    """在子进程中处理一组Excel文件，返回与输入顺序一致的结果"""
+    return [generator._generate_quiz_safely(excel_file, watermark) for excel_file in excel_files]
+
+
+def _excel_file_path(excel_file: Union[str, ParsedWorkbook]) -> str:
+    """批量输入项对应的文件路径"""
+    return excel_file.file_path if isinstance(excel_file, ParsedWorkbook) else excel_file
+
+
+def _cancelled_result(excel_file: Union[str, ParsedWorkbook]) -> GenerationResult:
+    """因取消而未处理的文件的结果记录"""
+    excel_file = _excel_file_path(excel_file)
+    return GenerationResult(excel_file, cancelled=True, error=f"处理文件 {excel_file} 已取消")
+
+
+def normalize_answer(text: str) -> str:
+    """评分时比较的答案形式：去除首尾空白并转为小写，与页面中的 normalizeAnswer 一致"""
+    return text.strip().lower()
+
+
+def accepted_answers(answer: str) -> List[str]:
+    """填空题可接受的答案（已标准化），多个答案以 | 分隔"""
+    variants = [normalize_answer(variant) for variant in ANSWER_VARIANT_PATTERN.split(answer)]
+    return [variant for variant in variants if variant] or [normalize_answer(answer)]
+
+
+def grading_index(question: Dict[str, Any]) -> Dict[str, Any]:
+    """逐题计算评分索引：选择题为与答案文字相同的第一个选项的下标（没有匹配的选项时为 -1），填空题为可接受的答案列表
+
+    只用于没有评分索引的题目数据；process_questions 对以字母给出的答案直接使用该字母对应的选项。
+    """
+    if question['type'] == '填空题':
+        return {'accepted': accepted_answers(question['answer'])}
+    texts = [option['text'] for option in question['options']]
+    if question['answer'] in texts:
+        return {'correct': texts.index(question['answer'])}
+    # 没有完全相同的选项时忽略大小写和首尾空白比较
+    answer = normalize_answer(question['answer'])
+    texts = [normalize_answer(text) for text in texts]
+    return {'correct': texts.index(answer) if answer in texts else -1}
+
+
+def _excel_cell_to_str(value: Any) -> Optional[str]:
+    """将单元格的值转为字符串，整数值的浮点数去掉小数部分（与 pandas 按字符串读取一致）"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
 
 class QuizGenerator:
     """选择题生成器组件"""
@@ -12,30 +131,201 @@ class QuizGenerator:
         self.templates_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
         self.outputs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "outputs", "generated_quizzes")
         
+        # 题目数据嵌入格式: "json"（缩进JSON）或 "compact"（列式紧凑编码，体积更小）
+        self.payload_format = "json"
+        
+        # 题目结构生成方式: "prerendered"（预先生成全部题目HTML）或 "lazy"（只嵌入题目数据，由页面按需渲染）
+        self.question_markup = "prerendered"
+        
+        # 静态资源方式: "inline"（样式与脚本内嵌，单文件离线可用）或 "external"（引用输出目录中按内容哈希命名的共享资源文件）
+        self.asset_mode = "inline"
+        
+        # 是否压缩输出：去除页面与脚本中的注释和多余空白，题目数据不缩进
+        self.minify = False
+        
+        # Excel读取引擎: "auto"（自动选择最快的可用引擎）或 "calamine"、"openpyxl"、"xlrd"、"openpyxl-stream"
+        self.excel_engine = "auto"
+        # 大于 0 时逐块读取 .xlsx 工作簿并生成页面，每块包含的行数
+        self.stream_chunk_size = 0
+        # 最近一次读取Excel文件、标准化题目的耗时（秒）
+        self.last_parse_time = 0.0
+        self.last_normalize_time = 0.0
+        # 最近一次逐块读取的数据行数
+        self.last_row_count = 0
+        
+        # 构建缓存（BuildCache），为 None 时不使用缓存
+        self.build_cache: Optional[BuildCache] = None
+        
+        # 性能采集（Instrumentation），为 None 时不采集
+        self.instrumentation: Optional[Instrumentation] = None
+        
+        # 预压缩（Precompressor），设置时在每个输出文件旁生成 .gz/.br 副本，为 None 时不生成
+        self.precompressor: Optional[Precompressor] = None
+        
         # 确保输出目录存在
         os.makedirs(self.outputs_dir, exist_ok=True)
     
+    def select_excel_engine(self, file_path: str) -> str:
+        """选择读取Excel文件的引擎：优先使用 calamine，.xlsx 回退到 openpyxl 只读流式读取"""
+        if self.excel_engine != "auto":
+            return self.excel_engine
+        # pandas 2.2 起支持 calamine 引擎
+        pandas_version = tuple(int(part) for part in pd.__version__.split('.')[:2] if part.isdigit())
+        if pandas_version >= (2, 2) and importlib.util.find_spec('python_calamine') is not None:
+            return "calamine"
+        if file_path.lower().endswith('.xls'):
+            return "xlrd"
+        return "openpyxl-stream"
+    
     def read_excel_file(self, file_path: str) -> pd.DataFrame:
-        """读取Excel文件并验证格式"""
+        """读取Excel文件并验证格式，只读取必需的列，所有内容按字符串读取"""
         try:
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
-            
-            # 验证必需的列
-            required_columns = ['题干', '选项A', '选项B', '选项C', '选项D', '答案']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            start = time.perf_counter()
+            engine = self.select_excel_engine(file_path)
             
-            if missing_columns:
-                raise ValueError(f"Excel文件缺少必需的列: {missing_columns}")
+            if engine == "openpyxl-stream":
+                df = self._read_excel_streaming(file_path)
+            else:
+                # 先只读取表头验证必需的列，再读取数据
+                header = pd.read_excel(file_path, engine=engine, nrows=0)
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in header.columns]
+                if missing_columns:
+                    raise ValueError(f"Excel文件缺少必需的列: {missing_columns}")
+                
+                df = pd.read_excel(file_path, engine=engine, usecols=REQUIRED_COLUMNS, dtype=str)
+                df = df[REQUIRED_COLUMNS]
             
             # 填充空值
             df = df.fillna('')
             
+            self.last_parse_time = time.perf_counter() - start
             return df
             
         except Exception as e:
             raise Exception(f"读取Excel文件失败: {str(e)}")
     
+    def read_excel_header(self, file_path: str) -> List[str]:
+        """只读取第一个工作表的表头"""
+        try:
+            engine = self.select_excel_engine(file_path)
+            if engine == "openpyxl-stream":
+                from openpyxl import load_workbook
+                workbook = load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    header = next(workbook.worksheets[0].iter_rows(values_only=True), ())
+                finally:
+                    workbook.close()
+                return ['' if value is None else str(value) for value in header]
+            return [str(col) for col in pd.read_excel(file_path, engine=engine, nrows=0).columns]
+        except Exception as e:
+            raise Exception(f"读取Excel文件失败: {str(e)}")
+    
+    def read_excel_preview(self, file_path: str, rows: int = 5) -> pd.DataFrame:
+        """只读取前若干行的必需列，用于预览"""
+        try:
+            engine = self.select_excel_engine(file_path)
+            if engine == "openpyxl-stream":
+                data = list(itertools.islice(self._iter_excel_rows(file_path), rows))
+                return pd.DataFrame(data, columns=REQUIRED_COLUMNS, dtype=object).fillna('')
+            df = pd.read_excel(file_path, engine=engine, usecols=REQUIRED_COLUMNS, dtype=str, nrows=rows)
+            return df[REQUIRED_COLUMNS].fillna('')
+        except Exception as e:
+            raise Exception(f"读取Excel文件失败: {str(e)}")
+    
+    def count_excel_rows(self, file_path: str) -> int:
+        """获取数据行数：.xlsx 使用工作表记录的范围，无法获取时读取第一列计数"""
+        try:
+            if not file_path.lower().endswith('.xls'):
+                from openpyxl import load_workbook
+                workbook = load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    max_row = workbook.worksheets[0].max_row
+                finally:
+                    workbook.close()
+                if max_row is not None:
+                    return max(max_row - 1, 0)
+            engine = self.select_excel_engine(file_path)
+            if engine == "openpyxl-stream":
+                return sum(1 for _ in self._iter_excel_rows(file_path))
+            return len(pd.read_excel(file_path, engine=engine, usecols=[0]))
+        except Exception as e:
+            raise Exception(f"读取Excel文件失败: {str(e)}")
+    
+    def parse_workbook(self, file_path: str, content_hash: Optional[str] = None) -> ParsedWorkbook:
+        """创建可在预览、统计和生成之间复用的工作簿解析结果"""
+        return ParsedWorkbook(self, file_path, content_hash)
+    
+    def _read_excel_streaming(self, file_path: str) -> pd.DataFrame:
+        """使用 openpyxl 只读模式读取第一个工作表中的必需列"""
+        return pd.DataFrame(list(self._iter_excel_rows(file_path)), columns=REQUIRED_COLUMNS, dtype=object)
+    
+    def _iter_excel_rows(self, file_path: str) -> Iterator[List[Optional[str]]]:
+        """使用 openpyxl 只读模式逐行读取第一个工作表中的必需列"""
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            
+            # 验证表头
+            header = ['' if value is None else str(value) for value in next(rows, ())]
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+            if missing_columns:
+                raise ValueError(f"Excel文件缺少必需的列: {missing_columns}")
+            column_indexes = [header.index(col) for col in REQUIRED_COLUMNS]
+            
+            # 与 pandas 一致：只去掉表格末尾的空行，中间的空行在遇到后续数据时补上
+            pending_empty_rows = 0
+            for row in rows:
+                if not any(value is not None and value != '' for value in row):
+                    pending_empty_rows += 1
+                    continue
+                for _ in range(pending_empty_rows):
+                    yield [None] * len(REQUIRED_COLUMNS)
+                pending_empty_rows = 0
+                yield [_excel_cell_to_str(row[i]) if i < len(row) else None for i in column_indexes]
+        finally:
+            workbook.close()
+    
+    def iter_question_chunks(self, file_path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """逐块读取工作簿并标准化为题目，内存占用只与 chunk_size 有关"""
+        parse_time = 0.0
+        normalize_time = 0.0
+        start = 0
+        rows = []
+        resumed = time.perf_counter()
+        try:
+            for row in self._iter_excel_rows(file_path):
+                rows.append(row)
+                if len(rows) < chunk_size:
+                    continue
+                parse_time += time.perf_counter() - resumed
+                resumed = time.perf_counter()
+                questions = self._process_row_chunk(rows, start)
+                normalize_time += time.perf_counter() - resumed
+                start += len(rows)
+                rows = []
+                yield questions
+                resumed = time.perf_counter()
+            parse_time += time.perf_counter() - resumed
+            if rows:
+                resumed = time.perf_counter()
+                questions = self._process_row_chunk(rows, start)
+                normalize_time += time.perf_counter() - resumed
+                yield questions
+        except Exception as e:
+            raise Exception(f"读取Excel文件失败: {str(e)}")
+        finally:
+            self.last_parse_time = parse_time
+            self.last_normalize_time = normalize_time
+            self.last_row_count = start + len(rows)
+    
+    def _process_row_chunk(self, rows: List[List[Optional[str]]], start: int) -> List[Dict[str, Any]]:
+        """将一块原始行数据标准化为题目，题号从 start + 1 开始"""
+        df = pd.DataFrame(rows, columns=REQUIRED_COLUMNS, dtype=object,
+                          index=pd.RangeIndex(start, start + len(rows))).fillna('')
+        return self.process_questions(df)
+    
     def identify_question_type(self, row: pd.Series) -> str:
         """智能识别题目类型"""
         options = [row['选项A'], row['选项B'], row['选项C'], row['选项D']]
@@ -51,107 +341,245 @@ class QuizGenerator:
             return "其他选择题"
     
     def process_questions(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """处理题目数据，使用pandas向量化操作优化性能"""
-        questions = []
+        """处理题目数据，使用pandas/numpy列式操作优化性能"""
+        option_columns = ['选项A', '选项B', '选项C', '选项D']
+        option_labels = [col[-1] for col in option_columns]  # A, B, C, D
+        
+        # 所有选项列转为字符串并去除首尾空白；保持 object 类型，numpy 定长字符串会按最长的单元格为每个单元格分配内存
+        option_frame = df[option_columns].apply(lambda column: column.astype(str).str.strip())
+        option_texts = option_frame.to_numpy(dtype=object)
+        question_texts = df['题干'].astype(str).str.strip().to_numpy(dtype=object)
+        answer_texts = df['答案'].astype(str).str.strip().to_numpy(dtype=object)
+        
+        # 按非空选项数量识别题目类型
+        has_option = option_texts != ''
+        option_counts = has_option.sum(axis=1)
+        question_types = np.select(
+            [option_counts == 4, option_counts == 3, option_counts == 0],
+            ["四选项选择题", "三选项选择题", "填空题"],
+            default="其他选择题"
+        )
+        df['题目类型'] = question_types
         
-        # 向量化识别题目类型
-        df['题目类型'] = df.apply(self.identify_question_type, axis=1)
+        # 将答案字母映射为选项下标，再一次性取出对应的选项内容
+        answer_letters = np.array([text.upper() for text in answer_texts.tolist()], dtype=object)
+        letter_indexes = np.full(len(df), -1)
+        for i, label in enumerate(option_labels):
+            letter_indexes[answer_letters == label] = i
+        rows = np.arange(len(df))
+        matched = letter_indexes >= 0
+        safe_indexes = np.where(matched, letter_indexes, 0)
+        matched &= has_option[rows, safe_indexes]
+        is_choice = option_counts > 0
+        final_answers = np.where(matched & is_choice, option_texts[rows, safe_indexes], answer_texts)
         
-        for index, row in df.iterrows():
-            question_data = {
+        # 评分索引：正确选项在非空选项中的位置，页面评分时只需比较下标。答案为字母时即该字母对应的选项
+        # （选项内容重复时也只有该选项正确）；答案为文字时取与之相同（没有时忽略大小写比较）的第一个选项
+        positions = np.cumsum(has_option, axis=1) - 1
+        same_as_answer = (option_texts == final_answers[:, None]) & has_option
+        lowered_options = option_frame.apply(lambda column: column.str.lower()).to_numpy(dtype=object)
+        lowered_answers = np.array([text.lower() for text in final_answers.tolist()], dtype=object)
+        similar = (lowered_options == lowered_answers[:, None]) & has_option
+        same_as_answer = np.where(same_as_answer.any(axis=1)[:, None], same_as_answer, similar)
+        first_match = same_as_answer.argmax(axis=1)
+        text_indexes = np.where(same_as_answer.any(axis=1), positions[rows, first_match], -1)
+        correct_indexes = np.where(matched, positions[rows, safe_indexes], text_indexes)
+        
+        questions = []
+        for index, question, q_type, answer, choice, texts, mask, correct in zip(
+                df.index.tolist(), question_texts.tolist(), question_types.tolist(),
+                final_answers.tolist(), is_choice.tolist(), option_texts.tolist(), has_option.tolist(),
+                correct_indexes.tolist()):
+            item = {
                 'id': index + 1,
-                'question': str(row['题干']).strip(),
-                'type': row['题目类型'],
-                'answer': str(row['答案']).strip(),
-                'options': []
+                'question': question,
+                'type': q_type,
+                'answer': answer,
+                'options': [{'label': label, 'text': text}
+                            for label, text, present in zip(option_labels, texts, mask) if present] if choice else []
             }
-            
-            # 处理选择题选项
-            if '选择题' in row['题目类型']:
-                options = []
-                answer_letter = str(row['答案']).strip().upper()
-                correct_answer_text = ""
-                
-                for opt_key in ['选项A', '选项B', '选项C', '选项D']:
-                    opt_value = str(row[opt_key]).strip()
-                    if opt_value:
-                        option_letter = opt_key[-1]  # A, B, C, D
-                        options.append({
-                            'label': option_letter,
-                            'text': opt_value
-                        })
-                        
-                        # 如果这个选项是正确答案，记录其内容
-                        if option_letter == answer_letter:
-                            correct_answer_text = opt_value
-                
-                question_data['options'] = options
-                # 将答案从字母转换为具体内容
-                question_data['answer'] = correct_answer_text if correct_answer_text else str(row['答案']).strip()
-            
-            questions.append(question_data)
+            if choice:
+                item['correct'] = correct
+            else:
+                item['accepted'] = accepted_answers(answer)
+            questions.append(item)
         
         return questions
     
+    def count_question_types(self, questions: List[Dict[str, Any]],
+                             counts: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """统计各题型的题目数量，传入 counts 时在其基础上累加"""
+        counts = {} if counts is None else counts
+        for question in questions:
+            q_type = question['type']
+            counts[q_type] = counts.get(q_type, 0) + 1
+        return counts
+    
     def load_template(self, template_name: str) -> str:
-        """加载模板文件"""
+        """加载模板文件（经进程级注册表缓存，文件修改后自动重新读取）"""
         template_path = os.path.join(self.templates_dir, template_name)
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return get_template_registry(self.templates_dir).load(template_name)
         except FileNotFoundError:
             raise Exception(f"模板文件不存在: {template_path}")
     
-    def generate_quiz_html(self, questions: List[Dict[str, Any]], quiz_title: str, watermark: str = "坦克云课堂") -> str:
-        """生成完整的HTML测试页面"""
-        # 加载模板
-        header_html = self.load_template('header.html')
-        footer_html = self.load_template('footer.html')
-        
-        # 读取CSS样式
-        css_content = self.load_template('styles.css')
-        
-        # 添加水印样式
-        watermark_css = f"""
-        .navigation-container {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-top: 20px;
-        }}
+    def get_page_fragments(self) -> Dict[str, str]:
+        """获取预组装的页面静态片段：样式（含水印样式）、页头和页脚；压缩输出时片段在缓存前压缩"""
+        def build(css: str, header: str, footer: str) -> Dict[str, str]:
+            fragments = {
+                'css': css + WATERMARK_CSS,
+                'header': header,
+                'footer': footer,
+                # 共享资源模式下页头脚本并入运行脚本文件
+                'header_markup': HEADER_SCRIPT_PATTERN.sub('', header).rstrip(),
+                'header_script': '\n'.join(HEADER_SCRIPT_PATTERN.findall(header))
+            }
+            if self.minify:
+                fragments = {
+                    'css': minify_css(fragments['css']),
+                    'header': minify_html(fragments['header']).strip(),
+                    'footer': minify_html(fragments['footer']).strip(),
+                    'header_markup': minify_html(fragments['header_markup']).strip(),
+                    'header_script': minify_js(fragments['header_script']).strip()
+                }
+            return fragments
         
-        .nav-buttons {{
-            display: flex;
-            gap: 10px;
-        }}
+        try:
+            return get_template_registry(self.templates_dir).fragment(
+                'page:min' if self.minify else 'page', ('styles.css', 'header.html', 'footer.html'), build)
+        except FileNotFoundError as e:
+            raise Exception(f"模板文件不存在: {e.filename}")
+    
+    def load_script(self, template_name: str) -> str:
+        """加载脚本模板，压缩输出时返回缓存的压缩结果"""
+        if not self.minify:
+            return self.load_template(template_name)
+        try:
+            return get_template_registry(self.templates_dir).fragment(
+                f'min:{template_name}', (template_name,), lambda source: minify_js(source).strip() + '\n')
+        except FileNotFoundError as e:
+            raise Exception(f"模板文件不存在: {e.filename}")
+    
+    def get_shared_assets(self) -> Dict[str, str]:
+        """获取共享资源文件的名称与内容，文件名包含内容哈希"""
+        template_names = ['styles.css', 'header.html', 'footer.html', 'quiz_runtime.js']
+        if self.payload_format == "compact":
+            template_names.append('compact_decoder.js')
+        if self.question_markup == "lazy":
+            template_names.append('lazy_questions.js')
         
-        .watermark {{
-            font-size: 12px;
-            color: #666;
-            opacity: 0.5;
-            pointer-events: none;
-            font-family: Arial, sans-serif;
-            margin-right: 10px;
-        }}
-        """
-        css_content += watermark_css
+        def build(*_):
+            fragments = self.get_page_fragments()
+            runtime_parts = [fragments['header_script'], "\n" if self.minify else "\n// 测试数据和状态管理\n"]
+            if self.payload_format == "compact":
+                runtime_parts.append(self.load_script('compact_decoder.js'))
+                runtime_parts.append("let originalQuestions = decodeQuestions(quizData);\n")
+            else:
+                runtime_parts.append("let originalQuestions = quizData;\n")
+            runtime_parts.append(self.load_script('quiz_runtime.js'))
+            if self.question_markup == "lazy":
+                runtime_parts.append(self.load_script('lazy_questions.js'))
+            runtime_js = ''.join(runtime_parts)
+            css = fragments['css']
+            return {
+                'css_name': f"quiz.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css",
+                'css': css,
+                'js_name': f"quiz-runtime.{hashlib.sha256(runtime_js.encode('utf-8')).hexdigest()[:12]}.js",
+                'js': runtime_js
+            }
         
-        # 生成题目HTML
-        questions_html = self.generate_questions_html(questions)
+        try:
+            return get_template_registry(self.templates_dir).fragment(
+                f'assets:{self.payload_format}:{self.question_markup}:{int(self.minify)}', template_names, build)
+        except FileNotFoundError as e:
+            raise Exception(f"模板文件不存在: {e.filename}")
+    
+    def write_shared_assets(self, target_dir: Optional[str] = None) -> List[str]:
+        """将共享资源文件写入目标目录（默认输出目录），已存在的同名文件不再重复写入"""
+        target_dir = target_dir or self.outputs_dir
+        assets = self.get_shared_assets()
+        paths = []
+        for name_key, content_key in (('css_name', 'css'), ('js_name', 'js')):
+            path = os.path.join(target_dir, assets[name_key])
+            if not os.path.exists(path):
+                # 先写临时文件再替换，避免并行进程读到不完整的文件
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(assets[content_key])
+                os.replace(temp_path, path)
+            paths.append(path)
+        if self.precompressor is not None:
+            self.precompressor.compress_files(paths)
+        return paths
+    
+    def get_template_version(self) -> str:
+        """获取全部模板内容的哈希，模板文件修改后随之变化"""
+        try:
+            return get_template_registry(self.templates_dir).fragment(
+                'version', TEMPLATE_FILES,
+                lambda *contents: hashlib.sha256('\0'.join(contents).encode('utf-8')).hexdigest()
+            )
+        except FileNotFoundError as e:
+            raise Exception(f"模板文件不存在: {e.filename}")
+    
+    def get_build_cache_key(self, excel_file_path: str, watermark: str, content_hash: Optional[str] = None) -> str:
+        """根据工作簿内容、文件名、模板版本、水印及输出设置计算构建缓存键"""
+        parts = [
+            BUILD_CACHE_VERSION,
+            content_hash or file_sha256(excel_file_path),
+            os.path.basename(excel_file_path),
+            watermark,
+            self.payload_format,
+            self.question_markup,
+            self.asset_mode,
+            self.minify,
+            self.get_template_version()
+        ]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def get_template_cache_stats(self) -> Dict[str, int]:
+        """获取模板缓存的命中统计"""
+        return get_template_registry(self.templates_dir).stats()
+    
+    def iter_quiz_html(self, questions: List[Dict[str, Any]], quiz_title: str, watermark: str = "坦克云课堂") -> Iterator[str]:
+        """逐段生成完整的HTML测试页面，避免在内存中拼接整份文档"""
+        return self.iter_page_html(quiz_title, watermark, len(questions),
+                                   self.iter_questions_html(questions), self.iter_payload_json(questions))
+    
+    def iter_page_html(self, quiz_title: str, watermark: str, question_count: int,
+                       questions_html: Iterable[str], payload_json: Iterable[str]) -> Iterator[str]:
+        """由已编码的题目HTML与题目数据逐段组装HTML测试页面"""
+        # 加载预组装的模板片段
+        fragments = self.get_page_fragments()
+        footer_html = fragments['footer']
+        if self.asset_mode == "external":
+            assets = self.get_shared_assets()
+            header_html = fragments['header_markup']
+            style_html = f'<link rel="stylesheet" href="{assets["css_name"]}">'
+        elif self.minify:
+            header_html = fragments['header']
+            style_html = f"<style>{fragments['css']}</style>"
+        else:
+            header_html = fragments['header']
+            style_html = f"<style>\n{fragments['css']}\n    </style>"
+        # 压缩输出时只在此压缩页面骨架，样式、页头、页脚和脚本模板已预先压缩并缓存
+        markup = minify_html if self.minify else (lambda text: text)
         
-        # 生成完整HTML
-        html_content = f"""<!DOCTYPE html>
+        # 页面头部、样式和测试控制区
+        yield markup(f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{quiz_title}</title>
-    <style>
-{css_content}
-    </style>
+    """)
+        yield style_html
+        yield markup("""
 </head>
 <body>
-    {header_html}
+    """)
+        yield header_html
+        yield markup(f"""
     
     <main class="content">
         <div class="container">
@@ -184,7 +612,7 @@ class QuizGenerator:
                     <div class="progress-bar">
                         <div class="progress-fill" id="progressFill"></div>
                     </div>
-                    <div class="progress-text" id="progressText">0 / {len(questions)}</div>
+                    <div class="progress-text" id="progressText">0 / {question_count}</div>
                 </div>
                 
                 <!-- 题目导航 -->
@@ -192,7 +620,13 @@ class QuizGenerator:
                 
                 <!-- 题目容器 -->
                 <div id="questionsContainer" style="display: none;">
-                    {questions_html}
+                    """)
+        
+        # 题目HTML（懒渲染模式下由页面脚本按需生成）
+        if self.question_markup != "lazy":
+            yield from questions_html
+        
+        yield markup(f"""
                 </div>
                 
                 <!-- 导航按钮 -->
@@ -211,21 +645,52 @@ class QuizGenerator:
         </div>
     </main>
     
-    {footer_html}
+    """)
+        yield footer_html
+        yield markup("""
     
     <script>
-{self.generate_quiz_javascript(questions)}
+""")
+        
+        # 测试脚本
+        if self.asset_mode == "external":
+            yield "const quizData = "
+            yield from payload_json
+            yield markup(f""";
     </script>
+    <script src="{assets['js_name']}"></script>
 </body>
-</html>"""
-        
-        return html_content
+</html>""")
+        else:
+            yield from self.iter_inline_script(payload_json)
+            
+            yield markup("""
+    </script>
+</body>
+</html>""")
     
-    def generate_questions_html(self, questions: List[Dict[str, Any]]) -> str:
-        """生成题目HTML"""
-        html_parts = []
-        
-        for i, question in enumerate(questions):
+    def write_quiz_html(self, file_obj: IO[str], questions: List[Dict[str, Any]], quiz_title: str, watermark: str = "坦克云课堂",
+                        metrics: FileMetrics = NULL_METRICS) -> int:
+        """将HTML测试页面逐段写入文件对象，返回写入的字符数；metrics 记录题目HTML、脚本与写出各自的耗时"""
+        written = 0
+        start = time.perf_counter()
+        for chunk in self.iter_page_html(quiz_title, watermark, len(questions),
+                                         metrics.timed_iter('questions_html', self.iter_questions_html(questions)),
+                                         metrics.timed_iter('javascript', self.iter_payload_json(questions))):
+            file_obj.write(chunk)
+            written += len(chunk)
+        if metrics is not NULL_METRICS:
+            metrics.add_time('write', time.perf_counter() - start
+                             - metrics.timings.get('questions_html', 0.0) - metrics.timings.get('javascript', 0.0))
+        return written
+    
+    def generate_quiz_html(self, questions: List[Dict[str, Any]], quiz_title: str, watermark: str = "坦克云课堂") -> str:
+        """生成完整的HTML测试页面"""
+        return ''.join(self.iter_quiz_html(questions, quiz_title, watermark))
+    
+    def iter_questions_html(self, questions: List[Dict[str, Any]], start: int = 0) -> Iterator[str]:
+        """逐题生成题目HTML，各题之间以换行分隔；start 为第一道题在整份题库中的序号"""
+        for i, question in enumerate(questions, start):
             question_html = f"""
                 <div class="question-container" id="question_{i}" style="display: none;">
                     <div class="question-number">第 {i + 1} 题</div>
@@ -248,511 +713,320 @@ class QuizGenerator:
                 question_html += '</div>'
             
             question_html += '</div>'
-            html_parts.append(question_html)
+            if self.minify:
+                question_html = minify_html(question_html).strip()
+            yield question_html if i == 0 else '\n' + question_html
+    
+    def generate_questions_html(self, questions: List[Dict[str, Any]]) -> str:
+        """生成题目HTML"""
+        return ''.join(self.iter_questions_html(questions))
+    
+    def encode_compact_payload(self, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """将题目列表编码为列式紧凑结构，由页面中的 decodeQuestions 还原"""
+        types: List[str] = []
+        type_indexes: Dict[str, int] = {}
+        ids = [question['id'] for question in questions]
+        payload: Dict[str, Any] = {'types': types, 'q': [], 't': [], 'a': [], 'o': [], 'k': [], 'l': {}}
         
-        return '\n'.join(html_parts)
+        for i, question in enumerate(questions):
+            text, type_index, answer, texts, grading, custom_labels = compact_question(question, type_indexes, types)
+            if custom_labels is not None:
+                payload['l'][str(i)] = custom_labels
+            payload['q'].append(text)
+            payload['t'].append(type_index)
+            payload['a'].append(answer)
+            payload['o'].append(texts)
+            payload['k'].append(grading)
+        
+        # 题号连续时只记录起始值
+        if ids and ids != list(range(ids[0], ids[0] + len(ids))):
+            payload['ids'] = ids
+        else:
+            payload['id0'] = ids[0] if ids else 1
+        return payload
     
-    def generate_quiz_javascript(self, questions: List[Dict[str, Any]]) -> str:
-        """生成测试页面的JavaScript代码"""
-        questions_json = json.dumps(questions, ensure_ascii=False, indent=2)
-        
-        js_code = f"""
-// 测试数据和状态管理
-let originalQuestions = {questions_json};
-let questions = [...originalQuestions];
-let currentQuestionIndex = 0;
-let userAnswers = {{}};
-let quizStarted = false;
-let startTime = null;
-
-// 开始测试
-function startQuiz() {{
-    const shuffleQuestions = document.getElementById('shuffleQuestions').checked;
-    const shuffleOptions = document.getElementById('shuffleOptions').checked;
-    
-    // 重置数据
-    questions = [...originalQuestions];
-    userAnswers = {{}};
-    currentQuestionIndex = 0;
-    startTime = new Date();
-    
-    // 题目乱序
-    if (shuffleQuestions) {{
-        questions = shuffleArray([...questions]);
-    }}
-    
-    // 选项乱序
-    if (shuffleOptions) {{
-        questions.forEach(question => {{
-            if (question.options && question.options.length > 0) {{
-                question.options = shuffleArray([...question.options]);
-            }}
-        }});
-    }}
-    
-    // 显示测试界面
-    document.querySelector('.quiz-controls').style.display = 'none';
-    document.getElementById('progressContainer').style.display = 'block';
-    document.getElementById('questionNav').style.display = 'flex';
-    document.getElementById('questionsContainer').style.display = 'block';
-    document.getElementById('navigationContainer').style.display = 'flex';
-    
-    // 初始化题目导航
-    initQuestionNavigation();
-    
-    // 显示第一题
-    showQuestion(0);
-    
-    // 更新进度
-    updateProgress();
-    
-    quizStarted = true;
-}}
-
-// 数组乱序函数
-function shuffleArray(array) {{
-    const newArray = [...array];
-    for (let i = newArray.length - 1; i > 0; i--) {{
-        const j = Math.floor(Math.random() * (i + 1));
-        [newArray[i], newArray[j]] = [newArray[j], newArray[i]];
-    }}
-    return newArray;
-}}
-
-// 初始化题目导航
-function initQuestionNavigation() {{
-    const nav = document.getElementById('questionNav');
-    nav.innerHTML = '';
-    
-    questions.forEach((_, index) => {{
-        const btn = document.createElement('button');
-        btn.className = 'question-nav-btn';
-        btn.textContent = index + 1;
-        btn.onclick = () => showQuestion(index);
-        btn.id = `nav_btn_${{index}}`;
-        nav.appendChild(btn);
-    }});
-}}
-
-// 显示指定题目
-function showQuestion(index) {{
-    // 隐藏所有题目
-    questions.forEach((_, i) => {{
-        const questionEl = document.getElementById(`question_${{i}}`);
-        if (questionEl) questionEl.style.display = 'none';
-    }});
-    
-    // 显示当前题目
-    const currentQuestionEl = document.getElementById(`question_${{index}}`);
-    if (currentQuestionEl) {{
-        currentQuestionEl.style.display = 'block';
-    }}
-    
-    currentQuestionIndex = index;
-    
-    // 更新导航按钮状态
-    updateNavigationButtons();
-    updateQuestionNavigation();
-    
-    // 恢复用户答案
-    restoreUserAnswer(index);
-}}
-
-// 选择选项
-function selectOption(questionIndex, optionIndex) {{
-    const question = questions[questionIndex];
-    const selectedOption = question.options[optionIndex];
-    const correctAnswer = question.answer;
-    
-    // 清除之前的选择和反馈样式
-    question.options.forEach((_, i) => {{
-        const optionEl = document.getElementById(`option_${{questionIndex}}_${{i}}`);
-        if (optionEl) {{
-            optionEl.classList.remove('selected', 'correct', 'incorrect');
-        }}
-    }});
-    
-    // 标记当前选择
-    const optionEl = document.getElementById(`option_${{questionIndex}}_${{optionIndex}}`);
-    if (optionEl) optionEl.classList.add('selected');
-    
-    // 保存用户答案
-    userAnswers[questionIndex] = selectedOption.text;
-    
-    // 显示即时反馈
-    const isCorrect = selectedOption.text === correctAnswer;
-    
-    // 标记所有选项的正确性
-    question.options.forEach((option, i) => {{
-        const optEl = document.getElementById(`option_${{questionIndex}}_${{i}}`);
-        if (optEl) {{
-            if (option.text === correctAnswer) {{
-                // 正确答案用绿色标记
-                optEl.classList.add('correct');
-            }} else if (i === optionIndex && !isCorrect) {{
-                // 用户选择的错误答案用红色标记
-                optEl.classList.add('incorrect');
-            }}
-        }}
-    }});
-    
-    // 更新题目导航状态
-    updateQuestionNavigation();
-    
-    // 显示提交按钮（如果是最后一题）
-    if (currentQuestionIndex === questions.length - 1) {{
-        document.getElementById('submitBtn').style.display = 'inline-block';
-    }}
-    
-    // 检查是否所有题目都已回答
-    const allAnswered = questions.every((_, index) => userAnswers.hasOwnProperty(index));
-    if (allAnswered) {{
-        document.getElementById('submitBtn').style.display = 'inline-block';
-    }}
-}}
-
-// 恢复用户答案
-function restoreUserAnswer(questionIndex) {{
-    const question = questions[questionIndex];
-    const userAnswer = userAnswers[questionIndex];
-    
-    if (!userAnswer) {{
-        // 清除所有反馈样式
-        if (question.options) {{
-            question.options.forEach((_, i) => {{
-                const optionEl = document.getElementById(`option_${{questionIndex}}_${{i}}`);
-                if (optionEl) {{
-                    optionEl.classList.remove('selected', 'correct', 'incorrect');
-                }}
-            }});
-        }}
-        return;
-    }}
-    
-    if (question.type === '填空题') {{
-        const input = document.getElementById(`answer_${{questionIndex}}`);
-        if (input) input.value = userAnswer;
-    }} else {{
-        // 选择题 - 只恢复选择状态，不显示反馈
-        question.options.forEach((option, i) => {{
-            const optionEl = document.getElementById(`option_${{questionIndex}}_${{i}}`);
-            if (optionEl) {{
-                // 清除所有样式
-                optionEl.classList.remove('selected', 'correct', 'incorrect');
-                
-                // 只标记用户选择的答案
-                if (option.text === userAnswer) {{
-                    optionEl.classList.add('selected');
-                }}
-            }}
-        }});
-    }}
-}}
-
-// 处理填空题输入
-document.addEventListener('input', function(e) {{
-    if (e.target.classList.contains('fill-blank-input')) {{
-        const questionIndex = parseInt(e.target.id.split('_')[1]);
-        userAnswers[questionIndex] = e.target.value.trim();
-        updateQuestionNavigation();
-    }}
-}});
-
-// 上一题
-function previousQuestion() {{
-    if (currentQuestionIndex > 0) {{
-        showQuestion(currentQuestionIndex - 1);
-    }}
-}}
-
-// 下一题
-function nextQuestion() {{
-    if (currentQuestionIndex < questions.length - 1) {{
-        showQuestion(currentQuestionIndex + 1);
-    }}
-}}
-
-// 更新导航按钮状态
-function updateNavigationButtons() {{
-    const prevBtn = document.getElementById('prevBtn');
-    const nextBtn = document.getElementById('nextBtn');
-    const submitBtn = document.getElementById('submitBtn');
-    
-    prevBtn.disabled = currentQuestionIndex === 0;
-    nextBtn.style.display = currentQuestionIndex === questions.length - 1 ? 'none' : 'inline-block';
-    
-    // 检查是否所有题目都已回答
-    const allAnswered = questions.every((_, index) => userAnswers.hasOwnProperty(index));
-    if (allAnswered || currentQuestionIndex === questions.length - 1) {{
-        submitBtn.style.display = 'inline-block';
-    }}
-}}
-
-// 更新题目导航状态
-function updateQuestionNavigation() {{
-    questions.forEach((question, index) => {{
-        const navBtn = document.getElementById(`nav_btn_${{index}}`);
-        if (navBtn) {{
-            navBtn.classList.remove('current', 'answered', 'correct', 'incorrect');
-            
-            if (index === currentQuestionIndex) {{
-                navBtn.classList.add('current');
-            }}
-            
-            if (userAnswers.hasOwnProperty(index)) {{
-                navBtn.classList.add('answered');
-                
-                // 检查答案正确性并添加相应的颜色状态
-                const userAnswer = userAnswers[index];
-                const correctAnswer = question.answer;
-                const isCorrect = userAnswer.toLowerCase().trim() === correctAnswer.toLowerCase().trim();
-                
-                if (isCorrect) {{
-                    navBtn.classList.add('correct');
-                }} else {{
-                    navBtn.classList.add('incorrect');
-                }}
-            }}
-        }}
-    }});
-}}
-
-// 更新进度
-function updateProgress() {{
-    const answeredCount = Object.keys(userAnswers).length;
-    const totalCount = questions.length;
-    const percentage = (answeredCount / totalCount) * 100;
-    
-    document.getElementById('progressFill').style.width = `${{percentage}}%`;
-    document.getElementById('progressText').textContent = `${{answeredCount}} / ${{totalCount}}`;
-}}
-
-// 提交测试
-function submitQuiz() {{
-    const endTime = new Date();
-    const totalTime = Math.round((endTime - startTime) / 1000);
+    def iter_payload_json(self, questions: List[Dict[str, Any]]) -> Iterator[str]:
+        """按 payload_format 逐段编码题目数据"""
+        if self.payload_format == "compact":
+            yield json.dumps(self.encode_compact_payload(questions), ensure_ascii=False, separators=(',', ':'))
+        elif self.minify:
+            yield from json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).iterencode(questions)
+        else:
+            yield from json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(questions)
     
-    // 计算成绩
-    const results = calculateResults();
+    def iter_quiz_javascript(self, questions: List[Dict[str, Any]]) -> Iterator[str]:
+        """逐段生成测试页面的JavaScript代码，题目数据按需编码"""
+        return self.iter_inline_script(self.iter_payload_json(questions))
     
-    // 显示结果
-    showResults(results, totalTime);
-}}
-
-// 计算成绩
-function calculateResults() {{
-    let correctCount = 0;
-    let allAnswers = [];
-    
-    questions.forEach((question, index) => {{
-        const userAnswer = userAnswers[index] || '';
-        const correctAnswer = question.answer;
-        
-        // 判断答案是否正确（忽略大小写）
-        const isCorrect = userAnswer.toLowerCase().trim() === correctAnswer.toLowerCase().trim();
-        
-        if (isCorrect) {{
-            correctCount++;
-        }}
-        
-        // 记录所有题目的答题情况
-        allAnswers.push({{
-            questionNumber: index + 1,
-            question: question.question,
-            userAnswer: userAnswer || '未回答',
-            correctAnswer: correctAnswer,
-            type: question.type,
-            isCorrect: isCorrect
-        }});
-    }});
-    
-    const totalCount = questions.length;
-    const wrongCount = totalCount - correctCount;
-    const accuracy = Math.round((correctCount / totalCount) * 100);
-    
-    return {{
-        totalCount,
-        correctCount,
-        wrongCount,
-        accuracy,
-        allAnswers
-    }};
-}}
-
-// 显示结果
-function showResults(results, totalTime) {{
-    const container = document.getElementById('resultsContainer');
-    
-    // 隐藏测试界面
-    document.getElementById('progressContainer').style.display = 'none';
-    document.getElementById('questionNav').style.display = 'none';
-    document.getElementById('questionsContainer').style.display = 'none';
-    document.getElementById('navigationContainer').style.display = 'none';
-    
-    // 确定成绩等级
-    let scoreClass = 'score-poor';
-    let scoreText = '需要加强';
-    if (results.accuracy >= 90) {{
-        scoreClass = 'score-excellent';
-        scoreText = '优秀';
-    }} else if (results.accuracy >= 70) {{
-        scoreClass = 'score-good';
-        scoreText = '良好';
-    }}
-    
-    // 生成所有题目回顾列表
-    let allAnswersHtml = '';
-    if (results.allAnswers.length > 0) {{
-        allAnswersHtml = `
-            <div class="all-answers">
-                <h3>题目回顾</h3>
-                ${{results.allAnswers.map(item => `
-                    <div class="answer-item ${{item.isCorrect ? 'correct-item' : 'incorrect-item'}}">
-                        <div class="answer-question">
-                            <span class="question-status ${{item.isCorrect ? 'status-correct' : 'status-incorrect'}}">
-                                ${{item.isCorrect ? '✓' : '✗'}}
-                            </span>
-                            第${{item.questionNumber}}题: ${{item.question}}
-                        </div>
-                        <div class="answer-details">
-                            <div class="user-answer ${{item.isCorrect ? 'correct-answer' : 'wrong-answer'}}">
-                                你的答案: ${{item.userAnswer}}
-                            </div>
-                            <div class="correct-answer-display">
-                                正确答案: ${{item.correctAnswer}}
-                            </div>
-                        </div>
-                    </div>
-                `).join('')}}
-            </div>
-        `;
-    }}
+    def iter_inline_script(self, payload_json: Iterable[str]) -> Iterator[str]:
+        """由已编码的题目数据逐段生成内嵌的JavaScript代码"""
+        comment = "\n" if self.minify else "\n// 测试数据和状态管理\n"
+        if self.payload_format == "compact":
+            yield comment
+            yield self.load_script('compact_decoder.js')
+            yield "let originalQuestions = decodeQuestions("
+            yield from payload_json
+            yield ");\n"
+        else:
+            yield comment + "let originalQuestions = "
+            yield from payload_json
+            yield ";\n"
+        yield self.load_script('quiz_runtime.js')
+        if self.question_markup == "lazy":
+            yield self.load_script('lazy_questions.js')
+        # 保持与内嵌脚本原有的缩进一致
+        if not self.minify:
+            yield "        "
     
-    container.innerHTML = `
-        <div class="results-container">
-            <h2 class="results-title">测试完成！</h2>
-            <div class="score-display ${{scoreClass}}">${{results.accuracy}}% (${{scoreText}})</div>
-            
-            <div class="stats-grid">
-                <div class="stat-item">
-                    <div class="stat-value">${{results.totalCount}}</div>
-                    <div class="stat-label">总题数</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-value">${{results.correctCount}}</div>
-                    <div class="stat-label">正确题数</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-value">${{results.wrongCount}}</div>
-                    <div class="stat-label">错误题数</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-value">${{Math.floor(totalTime / 60)}}:${{String(totalTime % 60).padStart(2, '0')}}</div>
-                    <div class="stat-label">用时</div>
-                </div>
-            </div>
-            
-            ${{allAnswersHtml}}
-            
-            <button class="restart-btn" onclick="restartQuiz()">重新开始</button>
-        </div>
-    `;
+    def generate_quiz_javascript(self, questions: List[Dict[str, Any]]) -> str:
+        """生成测试页面的JavaScript代码"""
+        return ''.join(self.iter_quiz_javascript(questions))
     
-    container.style.display = 'block';
-}}
-
-// 重新开始测试
-function restartQuiz() {{
-    // 重置所有状态
-    questions = [...originalQuestions];
-    userAnswers = {{}};
-    currentQuestionIndex = 0;
-    quizStarted = false;
-    startTime = null;
-    
-    // 重置界面
-    document.querySelector('.quiz-controls').style.display = 'flex';
-    document.getElementById('progressContainer').style.display = 'none';
-    document.getElementById('questionNav').style.display = 'none';
-    document.getElementById('questionsContainer').style.display = 'none';
-    document.getElementById('navigationContainer').style.display = 'none';
-    document.getElementById('resultsContainer').style.display = 'none';
-    
-    // 重置控制选项
-    document.getElementById('shuffleQuestions').checked = false;
-    document.getElementById('shuffleOptions').checked = false;
-}}
-
-// 监听进度更新
-setInterval(() => {{
-    if (quizStarted) {{
-        updateProgress();
-    }}
-}}, 1000);
-        """
-        
-        return js_code
+    def generate_quiz_from_excel(self, excel_file_path: str, watermark: str = "坦克云课堂",
+                                 parsed: Optional[ParsedWorkbook] = None) -> Tuple[str, str]:
+        """从Excel文件生成测试HTML，传入 parsed 时复用其中已读取的结果"""
+        result = self.generate_quiz_result(excel_file_path, watermark, parsed)
+        if self.instrumentation is not None:
+            self.instrumentation.emit_result(result)
+        return result.output_path, result.message
     
-    def generate_quiz_from_excel(self, excel_file_path: str, watermark: str = "坦克云课堂") -> Tuple[str, str]:
-        """从Excel文件生成测试HTML"""
+    def generate_quiz_result(self, excel_file_path: str, watermark: str = "坦克云课堂",
+                             parsed: Optional[ParsedWorkbook] = None) -> GenerationResult:
+        """从Excel文件生成测试HTML，返回包含题目统计、输出大小和各阶段耗时的结果记录"""
         try:
-            # 读取Excel文件
-            df = self.read_excel_file(excel_file_path)
-            
-            # 处理题目数据
-            questions = self.process_questions(df)
-            
-            if not questions:
-                raise Exception("没有找到有效的题目数据")
-            
             # 生成文件名
             base_name = os.path.splitext(os.path.basename(excel_file_path))[0]
             quiz_title = base_name
             output_filename = f"{base_name}.html"
             output_path = os.path.join(self.outputs_dir, output_filename)
+            result = GenerationResult(excel_file_path, output_path)
+            metrics = self.instrumentation.new_metrics() if self.instrumentation is not None else NULL_METRICS
+            
+            # 输入未变化时直接使用构建缓存中的结果
+            cache_key = None
+            if self.build_cache is not None:
+                cache_key = self.get_build_cache_key(excel_file_path, watermark,
+                                                     parsed.content_hash if parsed is not None else None)
+                cached = self.build_cache.get(cache_key)
+                if cached is not None:
+                    try:
+                        shutil.copyfile(cached['path'], output_path)
+                    except FileNotFoundError:
+                        # 条目在命中之后被其他进程淘汰，按未命中处理重新生成
+                        cached = None
+                if cached is not None:
+                    if self.asset_mode == "external":
+                        self.write_shared_assets()
+                    result.question_count = cached['question_count']
+                    result.type_counts = cached['type_counts']
+                    result.bytes_written = os.path.getsize(output_path)
+                    result.cached = True
+                    self._precompress_output(output_path, metrics)
+                    metrics.count('questions', result.question_count)
+                    metrics.count('bytes', result.bytes_written)
+                    result.metrics = metrics.as_dict()
+                    return result
+            
+            # 共享资源模式下确保资源文件存在
+            if self.asset_mode == "external":
+                self.write_shared_assets()
+            
+            use_parsed = parsed is not None and (parsed.is_loaded or not self.stream_chunk_size)
+            if self.stream_chunk_size and not use_parsed and not excel_file_path.lower().endswith('.xls'):
+                # 逐块读取和生成，内存占用与题库大小无关
+                start = time.perf_counter()
+                result.question_count = self._generate_quiz_streaming(excel_file_path, output_path, quiz_title,
+                                                                      watermark, result.type_counts, metrics)
+                result.parse_time = self.last_parse_time
+                result.normalize_time = self.last_normalize_time
+                result.render_time = time.perf_counter() - start - result.parse_time - result.normalize_time
+                metrics.count('rows', self.last_row_count)
+            else:
+                if use_parsed:
+                    # 复用已解析的工作簿
+                    questions = parsed.questions()
+                    result.parse_time = parsed.parse_time
+                    result.normalize_time = parsed.normalize_time
+                    metrics.count('rows', parsed.row_count())
+                else:
+                    # 读取Excel文件
+                    df = self.read_excel_file(excel_file_path)
+                    result.parse_time = self.last_parse_time
+                    
+                    # 处理题目数据
+                    start = time.perf_counter()
+                    questions = self.process_questions(df)
+                    result.normalize_time = time.perf_counter() - start
+                    metrics.count('rows', len(df))
+                
+                if not questions:
+                    raise Exception("没有找到有效的题目数据")
+                
+                result.question_count = len(questions)
+                self.count_question_types(questions, result.type_counts)
+                
+                # 逐段生成并保存HTML文件
+                start = time.perf_counter()
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    self.write_quiz_html(f, questions, quiz_title, watermark, metrics)
+                result.render_time = time.perf_counter() - start
             
-            # 生成HTML内容
-            html_content = self.generate_quiz_html(questions, quiz_title, watermark)
+            result.bytes_written = os.path.getsize(output_path)
+            self._precompress_output(output_path, metrics)
+            metrics.add_time('read_excel', result.parse_time)
+            metrics.add_time('process_questions', result.normalize_time)
+            metrics.count('questions', result.question_count)
+            metrics.count('bytes', result.bytes_written)
+            result.metrics = metrics.as_dict()
+            self.last_parse_time = result.parse_time
+            self.last_normalize_time = result.normalize_time
             
-            # 保存HTML文件
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            if cache_key is not None:
+                self.build_cache.put(cache_key, output_path, {'question_count': result.question_count,
+                                                              'type_counts': result.type_counts})
             
-            return output_path, f"成功生成测试文件: {output_filename}\n包含 {len(questions)} 道题目"
+            return result
             
         except Exception as e:
             raise Exception(f"生成测试失败: {str(e)}")
     
-    def batch_generate_quizzes(self, excel_files: List[str], watermark: str = "坦克云课堂") -> List[Tuple[str, str]]:
-        """批量生成测试HTML文件"""
-        results = []
+    def _precompress_output(self, output_path: str, metrics: FileMetrics = NULL_METRICS):
+        """设置了预压缩时为输出文件生成 .gz/.br 副本，内容未变化的文件跳过"""
+        if self.precompressor is not None:
+            with metrics.stage('precompress'):
+                self.precompressor.compress_file(output_path)
+    
+    def _generate_quiz_streaming(self, excel_file_path: str, output_path: str, quiz_title: str, watermark: str,
+                                 type_counts: Optional[Dict[str, int]] = None,
+                                 metrics: FileMetrics = NULL_METRICS) -> int:
+        """逐块读取工作簿，题目HTML与题目数据先暂存（超出上限时写入临时文件），最后组装写出，返回题目数量"""
+        payload = PayloadStream(self.payload_format, indent=None if self.minify else 2)
+        questions_html = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_SIZE, mode='w+', encoding='utf-8')
+        try:
+            for questions in self.iter_question_chunks(excel_file_path, self.stream_chunk_size):
+                if self.question_markup != "lazy":
+                    for chunk in metrics.timed_iter('questions_html', self.iter_questions_html(questions, payload.count)):
+                        questions_html.write(chunk)
+                with metrics.stage('javascript'):
+                    payload.add(questions)
+                if type_counts is not None:
+                    self.count_question_types(questions, type_counts)
+            
+            if payload.count == 0:
+                raise Exception("没有找到有效的题目数据")
+            
+            questions_html.seek(0)
+            with metrics.stage('write'), open(output_path, 'w', encoding='utf-8') as f:
+                for chunk in self.iter_page_html(quiz_title, watermark, payload.count,
+                                                 iter(lambda: questions_html.read(64 * 1024), ''),
+                                                 payload.iter_chunks()):
+                    f.write(chunk)
+            return payload.count
+        finally:
+            payload.close()
+            questions_html.close()
+    
+    def _generate_quiz_safely(self, excel_file: Union[str, ParsedWorkbook], watermark: str) -> GenerationResult:
+        """生成单个测试文件，失败时返回带错误信息的结果记录"""
+        parsed = excel_file if isinstance(excel_file, ParsedWorkbook) else None
+        excel_file = _excel_file_path(excel_file)
+        try:
+            return self.generate_quiz_result(excel_file, watermark, parsed)
+        except Exception as e:
+            return GenerationResult(excel_file, error=f"处理文件 {excel_file} 失败: {str(e)}")
+    
+    def batch_generate_quizzes(self, excel_files: List[Union[str, ParsedWorkbook]], watermark: str = "坦克云课堂",
+                               max_workers: int = 1, chunksize: int = 1,
+                               cancel_event: Optional[threading.Event] = None,
+                               on_result: Optional[Callable[[int, GenerationResult], None]] = None) -> List[GenerationResult]:
+        """批量生成测试HTML文件，返回与输入顺序一致的结果记录（GenerationResult）
         
-        for excel_file in excel_files:
-            try:
-                output_path, message = self.generate_quiz_from_excel(excel_file, watermark)
-                results.append((output_path, message))
-            except Exception as e:
-                results.append((None, f"处理文件 {excel_file} 失败: {str(e)}"))
+        max_workers 大于 1 时使用进程池并行处理，不同文件的解析与渲染在各进程间重叠进行；
+        chunksize 控制每个任务包含的文件数。
+        excel_files 中可以直接传入 ParsedWorkbook 以复用已读取的结果。
+        处理失败的文件其结果记录的 error 为错误信息；设置 cancel_event 后，尚未开始的文件不再处理，其结果标记为已取消。
+        on_result(序号, 结果) 在每个文件完成（或取消）时立即调用，可用于显示进度。
+        设置 instrumentation 时，各文件的采集记录和批次汇总在全部完成后写入输出端。
+        """
+        if self.instrumentation is None:
+            return self._batch_generate(excel_files, watermark, max_workers, chunksize, cancel_event, on_result)
         
+        start = time.perf_counter()
+        with self.instrumentation.profile_batch():
+            # 采集 cProfile/tracemalloc 时在当前进程中逐个处理，使报告覆盖解析与渲染
+            workers = 1 if self.instrumentation.profile else max_workers
+            results = self._batch_generate(excel_files, watermark, workers, chunksize, cancel_event, on_result)
+        self.instrumentation.emit_batch(results, time.perf_counter() - start)
         return results
     
-    def get_quiz_statistics(self, excel_file_path: str) -> Dict[str, Any]:
-        """获取题目统计信息"""
+    def _batch_generate(self, excel_files: List[Union[str, ParsedWorkbook]], watermark: str, max_workers: int,
+                        chunksize: int, cancel_event: Optional[threading.Event],
+                        on_result: Optional[Callable[[int, GenerationResult], None]] = None) -> List[GenerationResult]:
+        """批量生成的执行部分，参数含义同 batch_generate_quizzes"""
+        results: List[Optional[GenerationResult]] = [None] * len(excel_files)
+        
+        def store(start: int, chunk_results: List[GenerationResult]):
+            results[start:start + len(chunk_results)] = chunk_results
+            if on_result is not None:
+                for offset, result in enumerate(chunk_results):
+                    on_result(start + offset, result)
+        
+        if max_workers <= 1 or len(excel_files) <= 1:
+            for index, excel_file in enumerate(excel_files):
+                if cancel_event is not None and cancel_event.is_set():
+                    store(index, [_cancelled_result(excel_file)])
+                    continue
+                store(index, [self._generate_quiz_safely(excel_file, watermark)])
+            return results
+        
+        chunksize = max(1, chunksize)
+        chunks = [excel_files[i:i + chunksize] for i in range(0, len(excel_files), chunksize)]
+        
+        workers = min(max_workers, len(chunks))
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=PROCESS_CONTEXT)
         try:
-            df = self.read_excel_file(excel_file_path)
-            questions = self.process_questions(df)
-            
-            # 统计题目类型
-            type_counts = {}
-            for question in questions:
-                q_type = question['type']
-                type_counts[q_type] = type_counts.get(q_type, 0) + 1
-            
-            return {
-                'total_questions': len(questions),
-                'question_types': type_counts,
-                'file_name': os.path.basename(excel_file_path)
-            }
+            pending = {}
+            next_chunk = 0
+            while next_chunk < len(chunks) or pending:
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                # 按需提交，保证取消后不再有新的文件开始处理
+                while not cancelled and next_chunk < len(chunks) and len(pending) < workers * 2:
+                    future = executor.submit(_generate_quiz_chunk, self, chunks[next_chunk], watermark)
+                    pending[future] = next_chunk
+                    next_chunk += 1
+                if cancelled:
+                    for future in pending:
+                        future.cancel()
+                    while next_chunk < len(chunks):
+                        store(next_chunk * chunksize, [_cancelled_result(excel_file) for excel_file in chunks[next_chunk]])
+                        next_chunk += 1
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_index = pending.pop(future)
+                    start = chunk_index * chunksize
+                    chunk = chunks[chunk_index]
+                    if future.cancelled():
+                        chunk_results = [_cancelled_result(excel_file) for excel_file in chunk]
+                    elif future.exception() is not None:
+                        chunk_results = [GenerationResult(_excel_file_path(excel_file),
+                                                          error=f"处理文件 {_excel_file_path(excel_file)} 失败: {str(future.exception())}")
+                                         for excel_file in chunk]
+                    else:
+                        chunk_results = future.result()
+                    store(start, chunk_results)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return results
+    
+    def get_quiz_statistics(self, excel_file_path: Union[str, ParsedWorkbook]) -> Dict[str, Any]:
+        """获取题目统计信息，传入 ParsedWorkbook 时复用其解析结果"""
+        try:
+            parsed = excel_file_path if isinstance(excel_file_path, ParsedWorkbook) else self.parse_workbook(excel_file_path)
+            return parsed.statistics()
             
         except Exception as e:
-            return {'error': str(e)}
\ No newline at end of file
+            return {'error': str(e)}
@@ -0,0 +1,89 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+class TemplateRegistry:
+    """进程级模板注册表：缓存模板内容及预组装片段，按文件修改时间自动失效"""
+    
+    def __init__(self, templates_dir: str):
+        self.templates_dir = templates_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 模板名 -> ((修改时间, 文件大小), 内容)
+        self._templates: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        # 片段名 -> (各模板的(修改时间, 文件大小), 组装结果)
+        self._fragments: Dict[str, Tuple[Tuple[Tuple[int, int], ...], Any]] = {}
+    
+    def _stamp(self, template_name: str) -> Tuple[int, int]:
+        """获取模板文件的版本标识"""
+        stat = os.stat(os.path.join(self.templates_dir, template_name))
+        return stat.st_mtime_ns, stat.st_size
+    
+    def load(self, template_name: str) -> str:
+        """读取模板内容，文件未变化时直接返回缓存"""
+        stamp = self._stamp(template_name)
+        with self._lock:
+            cached = self._templates.get(template_name)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        
+        with open(os.path.join(self.templates_dir, template_name), 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        with self._lock:
+            self._templates[template_name] = (stamp, content)
+        return content
+    
+    def fragment(self, key: str, template_names: Iterable[str], builder: Callable[..., Any]) -> Any:
+        """获取由若干模板组装而成的片段，任一模板变化时重新组装"""
+        template_names = tuple(template_names)
+        stamps = tuple(self._stamp(name) for name in template_names)
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None and cached[0] == stamps:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        
+        value = builder(*[self.load(name) for name in template_names])
+        
+        with self._lock:
+            self._fragments[key] = (stamps, value)
+        return value
+    
+    def stats(self) -> Dict[str, int]:
+        """返回缓存命中统计"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'templates': len(self._templates),
+                'fragments': len(self._fragments)
+            }
+    
+    def clear(self):
+        """清空缓存及统计"""
+        with self._lock:
+            self._templates.clear()
+            self._fragments.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_registries: Dict[str, TemplateRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_template_registry(templates_dir: str) -> TemplateRegistry:
+    """获取指定模板目录对应的进程级注册表"""
+    templates_dir = os.path.abspath(templates_dir)
+    with _registries_lock:
+        registry = _registries.get(templates_dir)
+        if registry is None:
+            registry = TemplateRegistry(templates_dir)
+            _registries[templates_dir] = registry
+        return registry
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from components.bulk_compiler import BulkCompiler, collect_excel_files
+
+# 文件状态标识：(修改时间, 文件大小)
+Stamp = Tuple[int, int]
+
+
+def _stamp(path: str) -> Optional[Stamp]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkbookWatcher:
+    """轮询监视工作簿和模板目录，变化稳定后只重新生成有变化的工作簿；模板变化时重新生成全部
+
+    每次轮询只读取文件状态，不读取内容。连续保存时在最后一次变化 debounce 秒后才开始生成。
+    生成通过增量模式的 BulkCompiler 完成，内容实际未变化的文件（如只更新了修改时间）会被跳过。
+    """
+
+    def __init__(self, compiler: BulkCompiler, patterns: List[str], watermark: str = "坦克云课堂",
+                 interval: float = 1.0, debounce: float = 2.0):
+        self.compiler = compiler
+        # 增量清单记录已生成的文件，模板与设置变化时构建键随之变化
+        self.compiler.incremental = True
+        self.patterns = patterns
+        self.watermark = watermark
+        # 轮询间隔与静默时间（秒）
+        self.interval = interval
+        self.debounce = debounce
+        self.templates_dir = compiler.generator.templates_dir
+
+    def snapshot_workbooks(self) -> Dict[str, Stamp]:
+        """当前匹配的全部工作簿及其状态"""
+        stamps = {}
+        for path in collect_excel_files(self.patterns):
+            stamp = _stamp(path)
+            if stamp is not None:
+                stamps[path] = stamp
+        return stamps
+
+    def snapshot_templates(self) -> Dict[str, Stamp]:
+        """模板目录下全部文件的状态"""
+        stamps = {}
+        for root, _, names in os.walk(self.templates_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                stamp = _stamp(path)
+                if stamp is not None:
+                    stamps[path] = stamp
+        return stamps
+
+    def run(self, stop_event: Optional[threading.Event] = None,
+            on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+            on_batch: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """先生成一次全部工作簿（未变化的跳过），之后持续监视，直到 stop_event 被设置
+
+        on_result 同 BulkCompiler.compile；on_batch(汇总) 在每批生成完成后调用。
+        """
+        stop_event = stop_event or threading.Event()
+        workbooks = self.snapshot_workbooks()
+        templates = self.snapshot_templates()
+        if workbooks:
+            self._compile(sorted(workbooks), on_result, on_batch)
+
+        dirty: Set[str] = set()
+        templates_dirty = False
+        last_change = 0.0
+        while not stop_event.wait(self.interval):
+            current_workbooks = self.snapshot_workbooks()
+            current_templates = self.snapshot_templates()
+            changed = {path for path, stamp in current_workbooks.items() if workbooks.get(path) != stamp}
+            if changed or current_templates != templates:
+                dirty |= changed
+                templates_dirty = templates_dirty or current_templates != templates
+                last_change = time.monotonic()
+            workbooks, templates = current_workbooks, current_templates
+
+            if (dirty or templates_dirty) and time.monotonic() - last_change >= self.debounce:
+                # 模板变化影响全部输出；否则只处理仍然存在的已变化文件
+                files = sorted(workbooks) if templates_dirty else sorted(dirty & workbooks.keys())
+                dirty = set()
+                templates_dirty = False
+                if files:
+                    self._compile(files, on_result, on_batch)
+
+    def _compile(self, files: List[str], on_result: Optional[Callable[[str, Dict[str, Any]], None]],
+                 on_batch: Optional[Callable[[Dict[str, Any]], None]]):
+        summary = self.compiler.compile(files, self.watermark, on_result=on_result)
+        if on_batch is not None:
+            on_batch(summary)
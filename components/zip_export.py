@@ -0,0 +1,228 @@
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterator, List, Optional, Tuple
+
+from components.build_cache import BuildCache
+from components.payload_stream import DEFAULT_SPOOL_SIZE
+from components.precompress import GZIP_SUFFIX, read_gzip_member
+
+# 读取与复制文件时的块大小
+BLOCK_SIZE = 1024 * 1024
+
+# 本身已经压缩的文件类型，打包时直接存储不再压缩
+COMPRESSED_EXTENSIONS = ('.gz', '.br', '.zip', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.woff', '.woff2')
+
+# ZIP 格式常量
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+# 通用标志位第 11 位：文件名使用 UTF-8 编码
+UTF8_FLAG = 0x800
+# ZIP（非 ZIP64）格式的大小与数量上限
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+
+
+class ZipEntry:
+    """已压缩好、等待写入压缩包的一个条目"""
+
+    def __init__(self, arcname: str, method: int, crc: int, size: int, compressed_size: int,
+                 mtime: float, data: IO[bytes]):
+        self.arcname = arcname
+        self.method = method
+        self.crc = crc
+        self.size = size
+        self.compressed_size = compressed_size
+        self.mtime = mtime
+        # 压缩后的数据，写入压缩包后关闭
+        self.data = data
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    """转换为 ZIP 使用的 DOS 日期和时间"""
+    t = time.localtime(mtime)
+    year = max(t.tm_year, 1980)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+class ZipExporter:
+    """流式 ZIP 打包：各条目在线程池中并行压缩到暂存文件（超出上限时写入磁盘），再按顺序写入目标文件
+
+    压缩后的条目按内容哈希和压缩级别缓存在 cache 中，未修改的文件再次打包时直接复用。
+    文件旁有同步的 gzip 预压缩副本（Precompressor 生成）时直接使用其中的 deflate 数据，不再重新压缩。
+    """
+
+    def __init__(self, compression_level: int = 6, max_workers: Optional[int] = None,
+                 spool_size: int = DEFAULT_SPOOL_SIZE, cache: Optional[BuildCache] = None,
+                 use_precompressed: bool = True):
+        if not 0 <= compression_level <= 9:
+            raise ValueError(f"压缩级别需在 0 到 9 之间: {compression_level}")
+        # 压缩级别，0 表示只存储不压缩
+        self.compression_level = compression_level
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.spool_size = spool_size
+        self.cache = cache
+        # 是否复用 gzip 预压缩副本中的 deflate 数据
+        self.use_precompressed = use_precompressed
+
+    def _cache_key(self, file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        return f"{digest.hexdigest()}-{self.compression_level}"
+
+    def compress_entry(self, file_path: str, arcname: str) -> ZipEntry:
+        """读取并压缩一个文件"""
+        mtime = os.path.getmtime(file_path)
+        stored = self.compression_level == 0 or file_path.lower().endswith(COMPRESSED_EXTENSIONS)
+        method = ZIP_STORED if stored else ZIP_DEFLATED
+
+        if not stored and self.use_precompressed:
+            entry = self._precompressed_entry(file_path, arcname, mtime)
+            if entry is not None:
+                return entry
+
+        cache_key = None
+        if self.cache is not None and not stored:
+            cache_key = self._cache_key(file_path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                try:
+                    return ZipEntry(arcname, method, cached['crc'], cached['size'], cached['compressed_size'],
+                                    mtime, open(cached['path'], 'rb'))
+                except OSError:
+                    # 缓存文件可能已被并发淘汰，按未命中处理并重新压缩
+                    pass
+
+        if cache_key is not None:
+            # 直接压缩到缓存目录中的临时文件，完成后移入缓存
+            data = tempfile.NamedTemporaryFile(dir=self.cache.cache_dir, suffix='.tmp', delete=False)
+        else:
+            data = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        try:
+            crc = 0
+            size = 0
+            compressor = None if stored else zlib.compressobj(self.compression_level, zlib.DEFLATED, -15)
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                    crc = zlib.crc32(block, crc)
+                    size += len(block)
+                    data.write(block if compressor is None else compressor.compress(block))
+            if compressor is not None:
+                data.write(compressor.flush())
+            compressed_size = data.tell()
+        except Exception:
+            data.close()
+            if cache_key is not None:
+                os.remove(data.name)
+            raise
+
+        if cache_key is not None:
+            data.close()
+            cached_path = self.cache.put(cache_key, data.name,
+                                         {'crc': crc, 'size': size, 'compressed_size': compressed_size}, move=True)
+            return ZipEntry(arcname, method, crc, size, compressed_size, mtime, open(cached_path, 'rb'))
+        data.seek(0)
+        return ZipEntry(arcname, method, crc, size, compressed_size, mtime, data)
+
+    def _precompressed_entry(self, file_path: str, arcname: str, mtime: float) -> Optional[ZipEntry]:
+        """从修改时间与原文件一致的 gzip 副本中取出 deflate 数据、CRC32 和大小；副本不存在或不同步时返回 None"""
+        gzip_path = file_path + GZIP_SUFFIX
+        try:
+            stat = os.stat(file_path)
+            if os.stat(gzip_path).st_mtime_ns != stat.st_mtime_ns:
+                return None
+            member = read_gzip_member(gzip_path)
+        except OSError:
+            return None
+        if member is None or member[3] != stat.st_size & 0xFFFFFFFF:
+            return None
+
+        offset, compressed_size, crc, _ = member
+        data = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        try:
+            with open(gzip_path, 'rb') as f:
+                f.seek(offset)
+                remaining = compressed_size
+                while remaining:
+                    block = f.read(min(BLOCK_SIZE, remaining))
+                    if not block:
+                        raise ValueError(f"预压缩文件不完整: {gzip_path}")
+                    data.write(block)
+                    remaining -= len(block)
+        except Exception:
+            data.close()
+            raise
+        data.seek(0)
+        return ZipEntry(arcname, ZIP_DEFLATED, crc, stat.st_size, compressed_size, mtime, data)
+
+    def iter_entries(self, files: List[Tuple[str, str]]) -> Iterator[ZipEntry]:
+        """并行压缩 (文件路径, 包内路径) 列表，按输入顺序返回，同时进行中的条目数量有上限"""
+        if self.max_workers <= 1 or len(files) <= 1:
+            for file_path, arcname in files:
+                yield self.compress_entry(file_path, arcname)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = []
+            next_index = 0
+            try:
+                while next_index < len(files) or pending:
+                    while next_index < len(files) and len(pending) < self.max_workers * 2:
+                        pending.append(executor.submit(self.compress_entry, *files[next_index]))
+                        next_index += 1
+                    yield pending.pop(0).result()
+            finally:
+                for future in pending:
+                    if not future.cancel() and future.exception() is None:
+                        future.result().data.close()
+
+    def write(self, file_obj: IO[bytes], files: List[Tuple[str, str]]) -> int:
+        """将文件写入 ZIP 压缩包，只需顺序写入，返回写入的字节数"""
+        if len(files) > ZIP_MAX_ENTRIES:
+            raise ValueError(f"文件数量超过 ZIP 格式上限: {len(files)}")
+        central_directory = []
+        offset = 0
+        for entry in self.iter_entries(files):
+            try:
+                if max(entry.size, entry.compressed_size, offset) > ZIP_MAX_SIZE:
+                    raise ValueError("压缩包超过 4GB，超出 ZIP 格式上限")
+                name = entry.arcname.encode('utf-8')
+                dos_time, dos_date = _dos_datetime(entry.mtime)
+                fields = (20, UTF8_FLAG, entry.method, dos_time, dos_date,
+                          entry.crc, entry.compressed_size, entry.size, len(name))
+                file_obj.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, *fields, 0) + name)
+                shutil.copyfileobj(entry.data, file_obj, BLOCK_SIZE)
+                central_directory.append(struct.pack('<IH', 0x02014b50, 0x0314) +
+                                         struct.pack('<HHHHHIIIHHHHHII', *fields, 0, 0, 0, 0, 0o100644 << 16, offset) +
+                                         name)
+                offset += 30 + len(name) + entry.compressed_size
+            finally:
+                entry.data.close()
+
+        directory = b''.join(central_directory)
+        if offset + len(directory) > ZIP_MAX_SIZE:
+            raise ValueError("压缩包超过 4GB，超出 ZIP 格式上限")
+        file_obj.write(directory)
+        file_obj.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central_directory), len(central_directory),
+                                   len(directory), offset, 0))
+        return offset + len(directory) + 22
+
+    def export(self, target_path: str, files: List[Tuple[str, str]]) -> int:
+        """生成 ZIP 文件，先写临时文件再替换，返回文件大小"""
+        temp_path = f"{target_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                size = self.write(f, files)
+            os.replace(temp_path, target_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return size
@@ -1,22 +1,247 @@
 import streamlit as st
 import os
-import pandas as pd
-from typing import List, Tuple
+import copy
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from components.quiz_generator import QuizGenerator
+from components.build_cache import BuildCache
+from components.zip_export import ZipExporter
+from components.precompress import Precompressor, available_suffixes
+from components.instrumentation import Instrumentation, LoggingSink, JsonLinesSink, PrometheusTextSink
+from components.parsed_workbook import ParsedWorkbook
+from components.generation_result import GenerationResult
+from components.job_queue import Job, JobQueue
+import hashlib
 import tempfile
 import shutil
+import time
+import threading
+import weakref
 from datetime import datetime
-import zipfile
-import io
+from functools import partial
+
+try:
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    # 新版本 Streamlit 支持点击下载时才读取数据（download_button 的 data 可以是函数）
+    DEFERRED_DOWNLOADS = hasattr(MediaFileManager, 'add_deferred')
+except ImportError:
+    DEFERRED_DOWNLOADS = False
+
+# 结果页每页显示的单独下载文件数量
+DOWNLOADS_PER_PAGE = 20
+
+# 预览、统计、生成结果与工作簿解析结果的缓存有效期（秒）和条目上限
+CACHE_TTL_SECONDS = 3600
+MAX_CACHED_WORKBOOKS = 32
+MAX_CACHED_RESULTS = 64
+
+# 同时运行的后台生成任务数量，以及任务进度的刷新间隔（秒）
+MAX_CONCURRENT_JOBS = 2
+JOB_REFRESH_SECONDS = 1.0
+
+# 支持时任务进度区域单独定时刷新，不重新运行整个页面
+if hasattr(st, "fragment"):
+    auto_refresh = st.fragment(run_every=JOB_REFRESH_SECONDS)
+else:
+    def auto_refresh(func):
+        return func
+
+
+def read_output_file(file_path: str) -> bytes:
+    """读取生成的文件内容，用于下载"""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+@st.cache_resource(show_spinner=False)
+def get_base_generator() -> QuizGenerator:
+    """进程内共享的生成器，只创建一次并预先加载模板"""
+    generator = QuizGenerator()
+    # 使用紧凑题目数据格式并按需渲染题目，减小学生端页面体积
+    generator.payload_format = "compact"
+    generator.question_markup = "lazy"
+    # 大题库逐块读取生成，内存占用与题库大小无关
+    generator.stream_chunk_size = 5000
+    # 重复上传未修改的文件时直接复用之前的生成结果
+    generator.build_cache = BuildCache(os.path.join(os.path.dirname(generator.outputs_dir), "build_cache"))
+    # 设置 QUIZ_METRICS_DIR 时采集各阶段耗时，写入日志、metrics.jsonl 和 metrics.prom；
+    # QUIZ_PROFILE 可设为 cprofile 或 tracemalloc，按批次在该目录下生成性能报告
+    metrics_dir = os.environ.get("QUIZ_METRICS_DIR")
+    if metrics_dir:
+        generator.instrumentation = Instrumentation(
+            [LoggingSink(), JsonLinesSink(os.path.join(metrics_dir, "metrics.jsonl")),
+             PrometheusTextSink(os.path.join(metrics_dir, "metrics.prom"))],
+            profile=os.environ.get("QUIZ_PROFILE") or None,
+            profile_dir=os.path.join(metrics_dir, "profiles"))
+    # 预先组装页面片段和共享资源，第一次生成时不再读取模板
+    generator.get_page_fragments()
+    generator.get_shared_assets()
+    return generator
+
+
+@st.cache_resource(show_spinner=False)
+def get_base_zip_exporter() -> ZipExporter:
+    """进程内共享的ZIP导出器：多线程压缩，已压缩过的文件按内容哈希复用"""
+    outputs_root = os.path.dirname(get_base_generator().outputs_dir)
+    return ZipExporter(compression_level=6,
+                       cache=BuildCache(os.path.join(outputs_root, "zip_cache"), suffix=".deflate"))
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """文件的 (修改时间, 大小)，文件不存在时为 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_resource(show_spinner=False)
+def get_upload_dir() -> str:
+    """保存上传文件的临时目录"""
+    return tempfile.mkdtemp(prefix="quiz_uploads_")
+
+
+def upload_hash(uploaded_file) -> str:
+    """上传文件内容的 SHA-256 哈希"""
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=MAX_CACHED_WORKBOOKS, show_spinner=False)
+def get_cached_workbook(content_hash: str, file_name: str) -> ParsedWorkbook:
+    """按上传内容哈希缓存的工作簿解析结果，各会话的预览、统计和生成共用"""
+    # 每个缓存条目使用独立目录，避免同名文件互相覆盖；条目过期或被淘汰、且没有生成任务仍在使用该解析结果时删除
+    upload_dir = tempfile.mkdtemp(prefix=f"{content_hash[:16]}_", dir=get_upload_dir())
+    parsed = get_base_generator().parse_workbook(os.path.join(upload_dir, file_name), content_hash)
+    weakref.finalize(parsed, shutil.rmtree, upload_dir, True)
+    return parsed
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=MAX_CACHED_RESULTS, show_spinner=False)
+def cached_preview(content_hash: str, file_name: str, _app: "StreamlitQuizGeneratorApp", _uploaded_file) -> str:
+    """按上传内容缓存的预览结果"""
+    return _app.build_preview(_uploaded_file)
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=MAX_CACHED_RESULTS, show_spinner=False)
+def cached_statistics(content_hash: str, file_name: str, _app: "StreamlitQuizGeneratorApp", _uploaded_file) -> Dict[str, Any]:
+    """按上传内容缓存的题目统计信息"""
+    return _app.generator.get_quiz_statistics(_app.get_parsed_workbook(_uploaded_file))
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue() -> JobQueue:
+    """进程内共享的后台生成任务队列，浏览器重新连接后仍可按任务ID取回结果"""
+    return JobQueue(max_workers=MAX_CONCURRENT_JOBS, max_finished=MAX_CACHED_RESULTS, ttl=CACHE_TTL_SECONDS)
+
 
 class StreamlitQuizGeneratorApp:
     """选择题生成器Streamlit应用"""
     
     def __init__(self):
-        self.generator = QuizGenerator()
+        # 共享生成器的浅拷贝：模板、构建缓存和性能采集在进程内共用，导出设置各会话独立
+        self.generator = copy.copy(get_base_generator())
+        self.zip_exporter = copy.copy(get_base_zip_exporter())
+        # 批量生成时使用的并行进程数
+        self.max_workers = os.cpu_count() or 1
         if 'temp_dir' not in st.session_state:
             st.session_state.temp_dir = tempfile.mkdtemp()
     
+    def get_parsed_workbook(self, uploaded_file) -> ParsedWorkbook:
+        """获取上传文件的解析结果，相同内容只保存和解析一次"""
+        parsed = get_cached_workbook(upload_hash(uploaded_file), uploaded_file.name)
+        if not os.path.exists(parsed.file_path):
+            os.makedirs(os.path.dirname(parsed.file_path), exist_ok=True)
+            # 先写临时文件再替换，其他会话不会读到不完整的文件
+            temp_path = f"{parsed.file_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(uploaded_file.getvalue())
+            os.replace(temp_path, parsed.file_path)
+        return parsed
+    
+    def submit_generation(self, files: List, watermark: str = "坦克云课堂") -> Optional[Job]:
+        """将生成提交为后台任务并返回任务；相同内容和设置、生成文件仍存在的任务直接复用。没有有效文件时返回 None"""
+        valid_files, invalid_files = self.split_uploads(files)
+        if not valid_files:
+            return None
+        
+        upload_keys = tuple((parsed.content_hash, parsed.name) for parsed in valid_files)
+        settings = (self.generator.asset_mode, self.generator.payload_format, self.generator.question_markup,
+                    self.generator.minify, self.generator.precompressor is not None)
+        # 任务在后台线程中运行，使用当前设置的独立副本
+        runner = copy.copy(self)
+        runner.generator = copy.copy(self.generator)
+        # 输出路径只由文件名决定，其他设置的生成会覆盖同名文件；文件状态与任务记录一致时才复用
+        return get_job_queue().submit(
+            lambda job: runner.run_generation(valid_files, invalid_files, watermark, job),
+            total=len(valid_files),
+            key=(upload_keys, tuple(invalid_files), watermark, settings),
+            reuse=lambda job: job.output is not None and all(
+                file_stamp(path) == stamp for path, _, stamp in job.output[3]))
+    
+    def run_generation(self, valid_files: List[ParsedWorkbook], invalid_files: List[str], watermark: str,
+                       job: Job) -> Tuple[str, str, List[str], List[Tuple[str, str, Optional[Tuple[int, int]]]]]:
+        """后台任务的执行部分，返回 (状态, 报告, 生成的文件, 导出文件)
+
+        导出文件为按本次生成的设置确定的 (路径, 包内路径, 文件状态) 列表，包括共享资源文件和预压缩副本；
+        之后的页面刷新使用新的生成器副本，ZIP打包只依据这里的记录。
+        """
+        status, report, generated_files = self.generate_report(valid_files, invalid_files, watermark,
+                                                               job.cancel_event, job.record)
+        export_files = [(path, arcname, file_stamp(path)) for path, arcname in self.collect_export_files(generated_files)]
+        return status, report, generated_files, export_files
+    
+    def current_job(self) -> Optional[Job]:
+        """当前会话的生成任务；会话中没有时按地址栏中的任务ID查找（浏览器重新连接）"""
+        job_id = st.session_state.get('job_id')
+        if job_id is None and hasattr(st, 'query_params'):
+            job_id = st.query_params.get("job")
+        if job_id is None:
+            return None
+        job = get_job_queue().get(job_id)
+        if job is None:
+            st.info("ℹ️ 生成任务已过期，请重新生成")
+            st.session_state.pop('job_id', None)
+            if hasattr(st, 'query_params'):
+                st.query_params.pop("job", None)
+            return None
+        st.session_state.job_id = job_id
+        return job
+    
+    @auto_refresh
+    def render_job_progress(self, job_id: str):
+        """显示任务进度和已完成文件的结果，支持时每秒单独刷新；任务结束后重新运行页面显示完整结果"""
+        job = get_job_queue().get(job_id)
+        if job is None or job.finished:
+            st.rerun()
+            return
+        
+        st.markdown(f"### ⏳ 生成任务 `{job.job_id}`")
+        st.progress(job.progress, text=f"已完成 {job.completed}/{job.total} 个文件，{job.questions} 道题目")
+        for result in job.results():
+            st.markdown(self.format_result_line(os.path.basename(result.excel_file), result))
+        
+        if job.cancel_event.is_set():
+            st.caption("正在取消，已开始处理的文件完成后停止...")
+        elif st.button("⏹️ 取消生成", key=f"cancel_{job.job_id}"):
+            job.cancel()
+            st.caption("正在取消，已开始处理的文件完成后停止...")
+    
+    def get_upload_statistics(self, uploaded_file) -> Dict[str, Any]:
+        """获取上传文件的题目统计信息"""
+        return cached_statistics(upload_hash(uploaded_file), uploaded_file.name, self, uploaded_file)
+    
+    def split_uploads(self, files: List) -> Tuple[List[ParsedWorkbook], List[str]]:
+        """验证文件格式，返回有效文件的解析结果与无效文件名"""
+        valid_files = []
+        invalid_files = []
+        for uploaded_file in files:
+            if uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
+                # 保存上传的文件到临时目录（复用已有的解析结果）
+                valid_files.append(self.get_parsed_workbook(uploaded_file))
+            else:
+                invalid_files.append(uploaded_file.name)
+        return valid_files, invalid_files
+    
     def process_uploaded_files(self, files: List, watermark: str = "坦克云课堂") -> Tuple[str, str, List[str]]:
         """处理上传的Excel文件"""
         if not files:
@@ -24,121 +249,188 @@ class StreamlitQuizGeneratorApp:
         
         try:
             # 验证文件格式
-            valid_files = []
-            invalid_files = []
-            
-            for uploaded_file in files:
-                if uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
-                    # 保存上传的文件到临时目录
-                    temp_file_path = os.path.join(st.session_state.temp_dir, uploaded_file.name)
-                    with open(temp_file_path, 'wb') as f:
-                        f.write(uploaded_file.getbuffer())
-                    valid_files.append(temp_file_path)
-                else:
-                    invalid_files.append(uploaded_file.name)
-            
+            valid_files, invalid_files = self.split_uploads(files)
             if not valid_files:
                 return "❌ 没有找到有效的Excel文件", "", []
-            
-            # 生成详细报告
-            report_lines = []
-            report_lines.append("📊 **文件处理报告**\n")
-            
-            if invalid_files:
-                report_lines.append(f"⚠️ **跳过的无效文件** ({len(invalid_files)}个):")
-                for file in invalid_files:
-                    report_lines.append(f"   • {file}")
-                report_lines.append("")
-            
-            # 批量生成测试文件
-            results = self.generator.batch_generate_quizzes(valid_files, watermark)
-            
-            # 统计结果
-            successful_files = []
-            failed_files = []
-            total_questions = 0
-            
-            for file_path, result in zip(valid_files, results):
-                file_name = os.path.basename(file_path)
-                if isinstance(result, tuple) and len(result) == 2:
-                    output_path, message = result
-                    successful_files.append(output_path)
-                    
-                    # 从消息中提取题目数量
-                    try:
-                        # 从类似"成功生成测试文件: xxx.html\n包含 5 道题目"的消息中提取数字
-                        import re
-                        match = re.search(r'包含 (\d+) 道题目', message)
-                        if match:
-                            questions_count = int(match.group(1))
-                            total_questions += questions_count
-                            report_lines.append(f"✅ **{file_name}**: 成功生成 {questions_count} 道题目")
-                        else:
-                            report_lines.append(f"✅ **{file_name}**: 生成成功")
-                    except (ValueError, AttributeError):
-                        report_lines.append(f"✅ **{file_name}**: 生成成功")
-                else:
-                    failed_files.append((file_name, str(result)))
-                    report_lines.append(f"❌ **{file_name}**: 处理失败 - {result}")
-            
-            # 添加统计信息
-            report_lines.append("")
-            report_lines.append("📈 **处理统计**")
-            report_lines.append(f"• 总文件数: {len(valid_files)}")
-            report_lines.append(f"• 成功处理: {len(successful_files)}")
-            report_lines.append(f"• 失败文件: {len(failed_files)}")
-            report_lines.append(f"• 总题目数: {total_questions}")
-            
-            if successful_files:
-                report_lines.append("")
-                report_lines.append(f"📁 **输出目录**: `{os.path.abspath(self.generator.outputs_dir)}`")
-                report_lines.append(f"📥 **生成文件**: {len(successful_files)} 个HTML文件")
-            
-            # 生成状态消息
-            if successful_files and not failed_files:
-                status = f"✅ 全部处理成功！共生成 {len(successful_files)} 个测试页面，包含 {total_questions} 道题目"
-            elif successful_files and failed_files:
-                status = f"⚠️ 部分处理成功！成功 {len(successful_files)} 个，失败 {len(failed_files)} 个"
-            else:
-                status = f"❌ 处理失败！{len(failed_files)} 个文件处理失败"
-            
-            return status, "\n".join(report_lines), successful_files
-            
+            return self.generate_report(valid_files, invalid_files, watermark)
+        
         except Exception as e:
             error_msg = f"❌ 处理过程中发生错误: {str(e)}"
             return error_msg, error_msg, []
     
-    def create_download_zip(self, generated_files: List[str]) -> bytes:
-        """创建包含所有生成文件的ZIP压缩包"""
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for file_path in generated_files:
-                if os.path.exists(file_path):
-                    # 使用文件名作为ZIP内的路径
-                    arcname = os.path.basename(file_path)
-                    zip_file.write(file_path, arcname)
-        
-        zip_buffer.seek(0)
-        return zip_buffer.getvalue()
+    @staticmethod
+    def format_result_line(file_name: str, result: GenerationResult) -> str:
+        """单个文件的处理结果说明"""
+        if result.cancelled:
+            return f"⏹️ **{file_name}**: 已取消"
+        if not result.ok:
+            return f"❌ **{file_name}**: 处理失败 - {result.error}"
+        if result.cached:
+            timing_note = " (缓存)"
+        else:
+            timing_note = (f"，解析 {result.parse_time:.3f} 秒，标准化 {result.normalize_time:.3f} 秒，"
+                           f"渲染 {result.render_time:.3f} 秒")
+        return f"✅ **{file_name}**: 成功生成 {result.question_count} 道题目，{result.bytes_written / 1024:.1f} KB{timing_note}"
+    
+    def generate_report(self, valid_files: List[ParsedWorkbook], invalid_files: List[str], watermark: str,
+                        cancel_event: Optional[threading.Event] = None,
+                        on_result: Optional[Callable[[int, GenerationResult], None]] = None) -> Tuple[str, str, List[str]]:
+        """批量生成测试文件并生成处理报告，返回 (状态, 报告, 生成的文件)"""
+        # 生成详细报告
+        report_lines = []
+        report_lines.append("📊 **文件处理报告**\n")
+        
+        if invalid_files:
+            report_lines.append(f"⚠️ **跳过的无效文件** ({len(invalid_files)}个):")
+            for file in invalid_files:
+                report_lines.append(f"   • {file}")
+            report_lines.append("")
+        
+        # 批量生成测试文件
+        results = self.generator.batch_generate_quizzes(valid_files, watermark, max_workers=self.max_workers,
+                                                        cancel_event=cancel_event, on_result=on_result)
+        
+        # 统计结果
+        successful_files = []
+        failed_files = []
+        cancelled_files = []
+        total_questions = 0
+        cache_hits = 0
+        
+        for parsed, result in zip(valid_files, results):
+            report_lines.append(self.format_result_line(parsed.name, result))
+            if result.ok:
+                successful_files.append(result.output_path)
+                total_questions += result.question_count
+                cache_hits += result.cached
+            elif result.cancelled:
+                cancelled_files.append(parsed.name)
+            else:
+                failed_files.append((parsed.name, result.error))
+        
+        # 添加统计信息
+        report_lines.append("")
+        report_lines.append("📈 **处理统计**")
+        report_lines.append(f"• 总文件数: {len(valid_files)}")
+        report_lines.append(f"• 成功处理: {len(successful_files)}")
+        report_lines.append(f"• 失败文件: {len(failed_files)}")
+        if cancelled_files:
+            report_lines.append(f"• 已取消: {len(cancelled_files)}")
+        report_lines.append(f"• 总题目数: {total_questions}")
+        if self.generator.build_cache is not None:
+            report_lines.append(f"• 构建缓存: 命中 {cache_hits} 个，未命中 {len(successful_files) - cache_hits} 个")
+        
+        if successful_files:
+            report_lines.append("")
+            report_lines.append(f"📁 **输出目录**: `{os.path.abspath(self.generator.outputs_dir)}`")
+            report_lines.append(f"📥 **生成文件**: {len(successful_files)} 个HTML文件")
+        
+        # 生成状态消息
+        if cancelled_files:
+            status = f"⚠️ 已取消！成功 {len(successful_files)} 个，失败 {len(failed_files)} 个，取消 {len(cancelled_files)} 个"
+        elif successful_files and not failed_files:
+            status = f"✅ 全部处理成功！共生成 {len(successful_files)} 个测试页面，包含 {total_questions} 道题目"
+        elif successful_files and failed_files:
+            status = f"⚠️ 部分处理成功！成功 {len(successful_files)} 个，失败 {len(failed_files)} 个"
+        else:
+            status = f"❌ 处理失败！{len(failed_files)} 个文件处理失败"
+        
+        return status, "\n".join(report_lines), successful_files
+    
+    def collect_export_files(self, generated_files: List[str]) -> List[Tuple[str, str]]:
+        """按当前导出设置列出需要打包的 (路径, 包内路径)：生成的页面、共享资源文件和预压缩副本"""
+        # 使用文件名作为ZIP内的路径
+        entries = [(file_path, os.path.basename(file_path)) for file_path in generated_files if os.path.exists(file_path)]
+        
+        # 共享资源模式下一并打包样式和脚本文件
+        if self.generator.asset_mode == "external":
+            entries += [(asset_path, os.path.basename(asset_path)) for asset_path in self.generator.write_shared_assets()]
+        
+        # 启用预压缩时一并打包 .gz/.br 副本（直接存储）；页面本身复用 gzip 副本中的压缩数据
+        if self.generator.precompressor is not None:
+            entries += [(sidecar_path, arcname + sidecar_path[len(path):])
+                        for path, arcname in list(entries)
+                        for sidecar_path in self.generator.precompressor.sidecar_paths(path)
+                        if self.generator.precompressor.is_current(path, sidecar_path)]
+        return entries
+    
+    def create_download_zip(self, export_files: List[Tuple[str, str, Optional[Tuple[int, int]]]]) -> str:
+        """创建包含所有导出文件（run_generation 记录的列表）的ZIP压缩包，返回压缩包路径"""
+        entries = [(path, arcname) for path, arcname, _ in export_files if os.path.exists(path)]
+        
+        # 文件内容和压缩级别未变化时直接复用已生成的压缩包（页面每次刷新都会调用）
+        signature = [(path, arcname, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path, arcname in entries]
+        signature.append(self.zip_exporter.compression_level)
+        key = hashlib.sha256(repr(signature).encode('utf-8')).hexdigest()[:16]
+        export_dir = os.path.join(st.session_state.temp_dir, "exports")
+        os.makedirs(export_dir, exist_ok=True)
+        zip_path = os.path.join(export_dir, f"quiz_files_{key}.zip")
+        if not os.path.exists(zip_path):
+            # 会话内只保留最新的压缩包
+            for entry in os.scandir(export_dir):
+                if entry.name.endswith('.zip'):
+                    os.remove(entry.path)
+            self.zip_exporter.export(zip_path, entries)
+        return zip_path
+    
+    def render_file_downloads(self, generated_files: List[str]):
+        """分页显示单独下载按钮，只有用户请求下载时才读取文件内容"""
+        files = [file_path for file_path in generated_files if os.path.exists(file_path)]
+        if not files:
+            return
+        
+        st.markdown("**单独下载:**")
+        pages = (len(files) + DOWNLOADS_PER_PAGE - 1) // DOWNLOADS_PER_PAGE
+        page = 1
+        if pages > 1:
+            page = int(st.number_input(f"页码（共 {pages} 页，{len(files)} 个文件）", min_value=1, max_value=pages,
+                                       value=1, step=1, key="download_page"))
+        
+        for file_path in files[(page - 1) * DOWNLOADS_PER_PAGE:page * DOWNLOADS_PER_PAGE]:
+            file_name = os.path.basename(file_path)
+            if DEFERRED_DOWNLOADS:
+                # 点击时才读取文件
+                st.download_button(
+                    label=f"📄 {file_name}",
+                    data=partial(read_output_file, file_path),
+                    file_name=file_name,
+                    mime="text/html",
+                    key=f"download_{file_name}",
+                    on_click="ignore"
+                )
+            elif st.session_state.get('prepared_download') == file_path:
+                st.download_button(
+                    label=f"📄 {file_name}",
+                    data=read_output_file(file_path),
+                    file_name=file_name,
+                    mime="text/html",
+                    key=f"download_{file_name}"
+                )
+            elif st.button(f"📄 准备下载 {file_name}", key=f"prepare_{file_name}"):
+                # 旧版本 Streamlit 不支持延迟读取，先选择文件再只读取这一个文件
+                st.session_state.prepared_download = file_path
+                st.rerun()
     
     def preview_excel_content(self, uploaded_file) -> str:
-        """预览Excel文件内容"""
+        """预览Excel文件内容，相同内容的预览结果直接复用"""
+        return cached_preview(upload_hash(uploaded_file), uploaded_file.name, self, uploaded_file)
+    
+    def build_preview(self, uploaded_file) -> str:
+        """生成Excel文件的预览内容"""
         try:
-            # 读取上传的文件
-            df = pd.read_excel(uploaded_file)
+            # 读取上传的文件（只读取表头和前5行）
+            parsed = self.get_parsed_workbook(uploaded_file)
+            existing_columns = parsed.header()
             
             # 基本信息
             preview_lines = []
             preview_lines.append(f"📄 **文件名**: {uploaded_file.name}")
-            preview_lines.append(f"📊 **数据行数**: {len(df)} 行")
-            preview_lines.append(f"📋 **列数**: {len(df.columns)} 列")
+            preview_lines.append(f"📊 **数据行数**: {parsed.row_count()} 行")
+            preview_lines.append(f"📋 **列数**: {len(existing_columns)} 列")
             preview_lines.append("")
             
             # 列名检查
-            required_columns = ['题干', '选项A', '选项B', '选项C', '选项D', '答案']
-            existing_columns = df.columns.tolist()
-            missing_columns = [col for col in required_columns if col not in existing_columns]
+            missing_columns = parsed.missing_columns()
             
             preview_lines.append("🔍 **列名检查**")
             if missing_columns:
@@ -155,7 +447,7 @@ class StreamlitQuizGeneratorApp:
             
             if not missing_columns:
                 # 只显示必需的列
-                preview_df = df[required_columns].head(5).fillna('')
+                preview_df = parsed.preview(5)
                 
                 for idx, row in preview_df.iterrows():
                     preview_lines.append(f"**题目 {idx + 1}:**")
@@ -169,6 +461,14 @@ class StreamlitQuizGeneratorApp:
             else:
                 preview_lines.append("⚠️ 由于缺少必需的列，无法预览题目内容")
             
+            # 题型统计（大题库生成时逐块读取，预览时不完整读取）
+            if not missing_columns and parsed.row_count() <= self.generator.stream_chunk_size:
+                statistics = self.get_upload_statistics(uploaded_file)
+                if 'error' not in statistics:
+                    preview_lines.append("📊 **题型统计**")
+                    for q_type, count in statistics['question_types'].items():
+                        preview_lines.append(f"• {q_type}: {count} 道")
+            
             return "\n".join(preview_lines)
             
         except Exception as e:
@@ -265,6 +565,27 @@ class StreamlitQuizGeneratorApp:
             
             # 固定水印文字
             watermark_text = "坦克云课堂"
+            
+            st.markdown("### 📦 导出方式")
+            shared_assets = st.checkbox(
+                "共享资源文件模式",
+                value=False,
+                help="多个测试页面共用同一份样式和脚本文件，适合批量发布到网站；关闭时每个页面为单文件，可离线使用"
+            )
+            minify_output = st.checkbox(
+                "压缩页面",
+                value=False,
+                help="去除页面、样式和脚本中的注释与多余空白，减小文件体积"
+            )
+            precompress_output = st.checkbox(
+                "生成预压缩文件",
+                value=False,
+                help=f"在每个页面旁生成 {' / '.join(available_suffixes())} 压缩副本，静态服务器可直接发送，无需每次请求时压缩；一并打包到ZIP中"
+            )
+            self.zip_exporter.compression_level = st.slider(
+                "ZIP压缩级别", min_value=0, max_value=9, value=6,
+                help="级别越高压缩包越小、打包越慢；0 表示只打包不压缩"
+            )
         
         # 主要内容区域
         col1, col2 = st.columns([2, 1])
@@ -314,53 +635,83 @@ class StreamlitQuizGeneratorApp:
             if not uploaded_files:
                 st.error("❌ 请先上传Excel文件")
             else:
-                with st.spinner("正在处理文件，请稍候..."):
-                    status, report, generated_files = self.process_uploaded_files(uploaded_files, watermark_text)
-                
-                # 显示处理状态
-                if "✅" in status:
-                    st.success(status)
-                elif "⚠️" in status:
-                    st.warning(status)
+                self.generator.asset_mode = "external" if shared_assets else "inline"
+                self.generator.minify = minify_output
+                self.generator.precompressor = Precompressor() if precompress_output else None
+                job = self.submit_generation(uploaded_files, watermark_text)
+                if job is None:
+                    st.error("❌ 没有找到有效的Excel文件")
                 else:
-                    st.error(status)
+                    # 任务ID写入地址栏，浏览器重新连接后仍可取回结果
+                    st.session_state.job_id = job.job_id
+                    if hasattr(st, 'query_params'):
+                        st.query_params["job"] = job.job_id
+                    st.session_state.generation = None
+                    st.session_state.download_page = 1
+                    st.session_state.pop('prepared_download', None)
+        
+        job = self.current_job()
+        if job is not None:
+            if not job.finished:
+                self.render_job_progress(job.job_id)
+                if not hasattr(st, "fragment"):
+                    # 不支持局部刷新时定时重新运行整个页面
+                    time.sleep(JOB_REFRESH_SECONDS)
+                    st.rerun()
+            elif st.session_state.get('generation_job') != job.job_id:
+                # 保存结果，翻页和下载引起页面刷新后仍然显示
+                st.session_state.generation_job = job.job_id
+                st.session_state.generation = job.output
+                if job.error:
+                    st.session_state.generation = (f"❌ 处理过程中发生错误: {job.error}", "", [], [])
+                elif job.output is None:
+                    st.session_state.generation = ("⚠️ 已取消！生成任务在开始前被取消", "", [], [])
+        
+        if st.session_state.get('generation'):
+            status, report, generated_files, export_files = st.session_state.generation
+            # 显示处理状态
+            if "✅" in status:
+                st.success(status)
+            elif "⚠️" in status:
+                st.warning(status)
+            else:
+                st.error(status)
+            
+            # 显示详细报告
+            if report:
+                st.markdown("### 📋 详细报告")
+                st.markdown(report)
+            
+            # 提供下载
+            if generated_files:
+                st.markdown("### 📥 下载生成的文件")
                 
-                # 显示详细报告
-                if report:
-                    st.markdown("### 📋 详细报告")
-                    st.markdown(report)
+                # 创建ZIP文件（写入磁盘，不在内存中拼接）
+                zip_path = self.create_download_zip(export_files)
                 
-                # 提供下载
-                if generated_files:
-                    st.markdown("### 📥 下载生成的文件")
-                    
-                    # 创建ZIP文件
-                    zip_data = self.create_download_zip(generated_files)
-                    
-                    # 提供ZIP下载
+                # 提供ZIP下载（支持时点击后才读取压缩包）
+                zip_name = f"quiz_files_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                if DEFERRED_DOWNLOADS:
                     st.download_button(
                         label="📦 下载所有HTML文件 (ZIP)",
-                        data=zip_data,
-                        file_name=f"quiz_files_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                        data=partial(read_output_file, zip_path),
+                        file_name=zip_name,
                         mime="application/zip",
+                        on_click="ignore",
                         use_container_width=True
                     )
-                    
-                    # 单独文件下载
-                    st.markdown("**单独下载:**")
-                    for file_path in generated_files:
-                        if os.path.exists(file_path):
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                file_content = f.read()
-                            
-                            file_name = os.path.basename(file_path)
-                            st.download_button(
-                                label=f"📄 {file_name}",
-                                data=file_content,
-                                file_name=file_name,
-                                mime="text/html",
-                                key=f"download_{file_name}"
-                            )
+                else:
+                    with open(zip_path, 'rb') as zip_file:
+                        st.download_button(
+                            label="📦 下载所有HTML文件 (ZIP)",
+                            data=zip_file,
+                            file_name=zip_name,
+                            mime="application/zip",
+                            use_container_width=True
+                        )
+                
+                # 单独文件下载
+                self.render_file_downloads(generated_files)
         
         # 使用说明
         with st.expander("📖 使用说明", expanded=False):
@@ -0,0 +1,20 @@
+// 还原列式紧凑编码的题目数据
+function decodeQuestions(p) {
+    return p.q.map((text, i) => {
+        const texts = p.o[i];
+        const labels = p.l[i] || 'ABCD';
+        const answer = p.a[i];
+        // 评分索引：选择题为正确选项下标，填空题为可接受的答案列表
+        const key = p.k ? p.k[i] : undefined;
+        return {
+            id: p.ids ? p.ids[i] : p.id0 + i,
+            question: text,
+            type: p.types[p.t[i]],
+            answer: typeof answer === 'number' ? texts[answer] : answer,
+            options: texts.map((optionText, j) => ({ label: labels[j], text: optionText })),
+            correct: Array.isArray(key) ? undefined : key,
+            accepted: Array.isArray(key) ? key : undefined
+        };
+    });
+}
+
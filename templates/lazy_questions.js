@@ -0,0 +1,38 @@
+
+// 懒渲染模式：页面不预置题目结构，显示题目时根据题目数据创建容器
+function renderQuestion(index) {
+    if (document.getElementById(`question_${index}`)) return;
+    
+    const question = questions[index];
+    const container = document.createElement('div');
+    container.className = 'question-container';
+    container.id = `question_${index}`;
+    container.style.display = 'none';
+    
+    let html = `
+        <div class="question-number">第 ${index + 1} 题</div>
+        <div class="question-text">${question.question}</div>
+    `;
+    if (question.type === '填空题') {
+        html += `<input type="text" class="fill-blank-input" id="answer_${index}" placeholder="请输入答案...">`;
+    } else {
+        html += '<div class="options-container">';
+        question.options.forEach((option, j) => {
+            html += `
+                <div class="option" onclick="selectOption(${index}, ${j})" id="option_${index}_${j}">
+                    <span class="option-label">${option.label}</span>
+                    <span class="option-text">${option.text}</span>
+                </div>
+            `;
+        });
+        html += '</div>';
+    }
+    
+    container.innerHTML = html;
+    document.getElementById('questionsContainer').appendChild(container);
+}
+
+// 清除已渲染的题目容器
+function clearRenderedQuestions() {
+    document.getElementById('questionsContainer').innerHTML = '';
+}
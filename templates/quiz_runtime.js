@@ -0,0 +1,591 @@
+let questions = [...originalQuestions];
+let currentQuestionIndex = 0;
+let userAnswers = {};
+// 作答时按评分索引判定的结果和选择题所选的选项下标，之后只需查表
+let answerCorrect = {};
+let userChoices = {};
+let quizStarted = false;
+let startTime = null;
+
+// 增量维护的界面状态，答题和切换题目时只更新受影响的元素
+let currentQuestionEl = null;
+let answeredCount = 0;
+
+// 题目导航每页的按钮数量，题目较多时只渲染当前页，按钮元素在翻页时复用
+const NAV_PAGE_SIZE = 50;
+let navButtons = [];
+let navPageStart = 0;
+let navPageControls = null;
+
+// 题目回顾每次追加的条目数量，滚动到列表末尾附近时在空闲时间继续生成
+const REVIEW_CHUNK_SIZE = 50;
+let reviewItems = [];
+let reviewRendered = 0;
+let reviewObserver = null;
+let reviewGeneration = 0;
+
+// 开始测试
+function startQuiz() {
+    const shuffleQuestions = document.getElementById('shuffleQuestions').checked;
+    const shuffleOptions = document.getElementById('shuffleOptions').checked;
+    
+    // 重置数据
+    questions = [...originalQuestions];
+    questions.forEach(ensureGrading);
+    userAnswers = {};
+    answerCorrect = {};
+    userChoices = {};
+    currentQuestionIndex = 0;
+    answeredCount = 0;
+    startTime = new Date();
+    
+    // 题目乱序
+    if (shuffleQuestions) {
+        questions = shuffleArray([...questions]);
+    }
+    
+    // 选项乱序
+    if (shuffleOptions) {
+        questions.forEach(question => {
+            if (question.options && question.options.length > 0) {
+                const correctOption = question.options[question.correct];
+                question.options = shuffleArray([...question.options]);
+                question.correct = question.options.indexOf(correctOption);
+            }
+        });
+    }
+    
+    // 懒渲染模式下按新的题目顺序重新渲染
+    if (typeof clearRenderedQuestions === 'function') {
+        clearRenderedQuestions();
+    }
+    
+    // 显示测试界面
+    document.querySelector('.quiz-controls').style.display = 'none';
+    document.getElementById('progressContainer').style.display = 'block';
+    document.getElementById('questionNav').style.display = 'flex';
+    document.getElementById('questionsContainer').style.display = 'block';
+    document.getElementById('navigationContainer').style.display = 'flex';
+    
+    // 初始化题目导航
+    initQuestionNavigation();
+    
+    // 显示第一题
+    showQuestion(0);
+    
+    // 更新进度
+    updateProgress();
+    
+    quizStarted = true;
+}
+
+// 评分时比较的答案形式，与生成时的 normalize_answer 一致
+function normalizeAnswer(text) {
+    return text.trim().toLowerCase();
+}
+
+// 题目数据未包含评分索引时（如自行构造的题目数据）按答案内容计算
+function ensureGrading(question) {
+    if (question.correct !== undefined || question.accepted !== undefined) return;
+    const answer = normalizeAnswer(question.answer);
+    if (question.type === '填空题') {
+        question.accepted = [answer];
+    } else {
+        question.correct = question.options.findIndex(option => normalizeAnswer(option.text) === answer);
+    }
+}
+
+// 数组乱序函数
+function shuffleArray(array) {
+    const newArray = [...array];
+    for (let i = newArray.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [newArray[i], newArray[j]] = [newArray[j], newArray[i]];
+    }
+    return newArray;
+}
+
+// 初始化题目导航
+function initQuestionNavigation() {
+    const nav = document.getElementById('questionNav');
+    nav.innerHTML = '';
+    
+    // 只创建一页按钮并保留引用，翻页时更新按钮对应的题号
+    const fragment = document.createDocumentFragment();
+    const pageSize = Math.min(NAV_PAGE_SIZE, questions.length);
+    navPageControls = null;
+    if (questions.length > NAV_PAGE_SIZE) {
+        navPageControls = {
+            prev: createNavPageButton('‹', () => renderNavPage(navPageStart - NAV_PAGE_SIZE)),
+            next: createNavPageButton('›', () => renderNavPage(navPageStart + NAV_PAGE_SIZE)),
+            label: document.createElement('span')
+        };
+        navPageControls.label.className = 'question-nav-range';
+        fragment.appendChild(navPageControls.prev);
+    }
+    navButtons = [];
+    for (let k = 0; k < pageSize; k++) {
+        const btn = document.createElement('button');
+        btn.className = 'question-nav-btn';
+        btn.onclick = () => showQuestion(navPageStart + k);
+        fragment.appendChild(btn);
+        navButtons.push(btn);
+    }
+    if (navPageControls) {
+        fragment.appendChild(navPageControls.next);
+        fragment.appendChild(navPageControls.label);
+    }
+    nav.appendChild(fragment);
+    renderNavPage(0);
+}
+
+// 题目导航的翻页按钮
+function createNavPageButton(text, onclick) {
+    const btn = document.createElement('button');
+    btn.className = 'question-nav-btn question-nav-page';
+    btn.textContent = text;
+    btn.onclick = onclick;
+    return btn;
+}
+
+// 显示从 start 开始的一页导航按钮
+function renderNavPage(start) {
+    navPageStart = Math.max(0, Math.min(start, questions.length - 1));
+    navPageStart -= navPageStart % NAV_PAGE_SIZE;
+    navButtons.forEach((btn, k) => {
+        const index = navPageStart + k;
+        btn.style.display = index < questions.length ? '' : 'none';
+        btn.textContent = index + 1;
+        updateNavButton(index);
+    });
+    if (navPageControls) {
+        const end = Math.min(navPageStart + NAV_PAGE_SIZE, questions.length);
+        navPageControls.prev.disabled = navPageStart === 0;
+        navPageControls.next.disabled = end === questions.length;
+        navPageControls.label.textContent = `${navPageStart + 1}-${end} / ${questions.length}`;
+    }
+}
+
+// 显示指定题目
+function showQuestion(index) {
+    // 只隐藏当前显示的题目
+    if (currentQuestionEl) currentQuestionEl.style.display = 'none';
+    
+    // 懒渲染模式下按需创建题目容器
+    if (typeof renderQuestion === 'function') {
+        renderQuestion(index);
+    }
+    
+    // 显示当前题目
+    currentQuestionEl = document.getElementById(`question_${index}`);
+    if (currentQuestionEl) {
+        currentQuestionEl.style.display = 'block';
+    }
+    
+    const previousIndex = currentQuestionIndex;
+    currentQuestionIndex = index;
+    
+    // 更新导航按钮状态（只更新之前和现在的题目，当前题目不在导航当前页时翻到所在页）
+    updateNavigationButtons();
+    if (index < navPageStart || index >= navPageStart + NAV_PAGE_SIZE) {
+        renderNavPage(index);
+    } else {
+        updateNavButton(previousIndex);
+        updateNavButton(index);
+    }
+    
+    // 恢复用户答案
+    restoreUserAnswer(index);
+}
+
+// 选择选项
+function selectOption(questionIndex, optionIndex) {
+    const question = questions[questionIndex];
+    const selectedOption = question.options[optionIndex];
+    
+    // 清除之前的选择和反馈样式
+    question.options.forEach((_, i) => {
+        const optionEl = document.getElementById(`option_${questionIndex}_${i}`);
+        if (optionEl) {
+            optionEl.classList.remove('selected', 'correct', 'incorrect');
+        }
+    });
+    
+    // 标记当前选择
+    const optionEl = document.getElementById(`option_${questionIndex}_${optionIndex}`);
+    if (optionEl) optionEl.classList.add('selected');
+    
+    // 按评分索引判断并保存用户答案
+    const isCorrect = optionIndex === question.correct;
+    userChoices[questionIndex] = optionIndex;
+    recordAnswer(questionIndex, selectedOption.text, isCorrect);
+    
+    // 显示即时反馈：正确答案用绿色标记，用户选择的错误答案用红色标记
+    const correctEl = document.getElementById(`option_${questionIndex}_${question.correct}`);
+    if (correctEl) correctEl.classList.add('correct');
+    if (!isCorrect && optionEl) optionEl.classList.add('incorrect');
+    
+    // 显示提交按钮（如果是最后一题或所有题目都已回答）
+    if (currentQuestionIndex === questions.length - 1 || answeredCount === questions.length) {
+        document.getElementById('submitBtn').style.display = 'inline-block';
+    }
+}
+
+// 保存答案及评分结果并更新该题的导航按钮与进度
+function recordAnswer(questionIndex, answer, isCorrect) {
+    if (!userAnswers.hasOwnProperty(questionIndex)) {
+        answeredCount++;
+    }
+    userAnswers[questionIndex] = answer;
+    answerCorrect[questionIndex] = isCorrect;
+    updateNavButton(questionIndex);
+    updateProgress();
+}
+
+// 恢复用户答案
+function restoreUserAnswer(questionIndex) {
+    const question = questions[questionIndex];
+    const userAnswer = userAnswers[questionIndex];
+    
+    if (!userAnswer) {
+        // 清除所有反馈样式
+        if (question.options) {
+            question.options.forEach((_, i) => {
+                const optionEl = document.getElementById(`option_${questionIndex}_${i}`);
+                if (optionEl) {
+                    optionEl.classList.remove('selected', 'correct', 'incorrect');
+                }
+            });
+        }
+        return;
+    }
+    
+    if (question.type === '填空题') {
+        const input = document.getElementById(`answer_${questionIndex}`);
+        if (input) input.value = userAnswer;
+    } else {
+        // 选择题 - 只恢复选择状态，不显示反馈
+        question.options.forEach((_, i) => {
+            const optionEl = document.getElementById(`option_${questionIndex}_${i}`);
+            if (optionEl) {
+                // 清除所有样式
+                optionEl.classList.remove('selected', 'correct', 'incorrect');
+                
+                // 只标记用户选择的答案
+                if (i === userChoices[questionIndex]) {
+                    optionEl.classList.add('selected');
+                }
+            }
+        });
+    }
+}
+
+// 处理填空题输入
+document.addEventListener('input', function(e) {
+    if (e.target.classList.contains('fill-blank-input')) {
+        const questionIndex = parseInt(e.target.id.split('_')[1]);
+        const answer = e.target.value.trim();
+        recordAnswer(questionIndex, answer, questions[questionIndex].accepted.includes(normalizeAnswer(answer)));
+    }
+});
+
+// 上一题
+function previousQuestion() {
+    if (currentQuestionIndex > 0) {
+        showQuestion(currentQuestionIndex - 1);
+    }
+}
+
+// 下一题
+function nextQuestion() {
+    if (currentQuestionIndex < questions.length - 1) {
+        showQuestion(currentQuestionIndex + 1);
+    }
+}
+
+// 更新导航按钮状态
+function updateNavigationButtons() {
+    const prevBtn = document.getElementById('prevBtn');
+    const nextBtn = document.getElementById('nextBtn');
+    const submitBtn = document.getElementById('submitBtn');
+    
+    prevBtn.disabled = currentQuestionIndex === 0;
+    nextBtn.style.display = currentQuestionIndex === questions.length - 1 ? 'none' : 'inline-block';
+    
+    // 检查是否所有题目都已回答
+    if (answeredCount === questions.length || currentQuestionIndex === questions.length - 1) {
+        submitBtn.style.display = 'inline-block';
+    }
+}
+
+// 更新单个题目导航按钮的状态
+function updateNavButton(index) {
+    const navBtn = navButtons[index - navPageStart];
+    if (!navBtn || index >= questions.length) return;
+    
+    const answered = userAnswers.hasOwnProperty(index);
+    navBtn.classList.toggle('current', index === currentQuestionIndex);
+    navBtn.classList.toggle('answered', answered);
+    
+    // 按作答时的评分结果添加相应的颜色状态
+    const isCorrect = answerCorrect[index] === true;
+    navBtn.classList.toggle('correct', answered && isCorrect);
+    navBtn.classList.toggle('incorrect', answered && !isCorrect);
+}
+
+// 更新进度（答案变化时调用）
+function updateProgress() {
+    const totalCount = questions.length;
+    const percentage = (answeredCount / totalCount) * 100;
+    
+    document.getElementById('progressFill').style.width = `${percentage}%`;
+    document.getElementById('progressText').textContent = `${answeredCount} / ${totalCount}`;
+}
+
+// 提交测试
+function submitQuiz() {
+    const endTime = new Date();
+    const totalTime = Math.round((endTime - startTime) / 1000);
+    
+    // 计算成绩
+    const results = calculateResults();
+    
+    // 显示结果
+    showResults(results, totalTime);
+}
+
+// 计算成绩
+function calculateResults() {
+    let correctCount = 0;
+    let allAnswers = [];
+    
+    questions.forEach((question, index) => {
+        const userAnswer = userAnswers[index] || '';
+        const correctAnswer = question.answer;
+        
+        // 作答时已按评分索引判断，未回答的题目计为错误
+        const isCorrect = answerCorrect[index] === true;
+        
+        if (isCorrect) {
+            correctCount++;
+        }
+        
+        // 记录所有题目的答题情况
+        allAnswers.push({
+            questionNumber: index + 1,
+            question: question.question,
+            userAnswer: userAnswer || '未回答',
+            correctAnswer: correctAnswer,
+            type: question.type,
+            isCorrect: isCorrect
+        });
+    });
+    
+    const totalCount = questions.length;
+    const wrongCount = totalCount - correctCount;
+    const accuracy = Math.round((correctCount / totalCount) * 100);
+    
+    return {
+        totalCount,
+        correctCount,
+        wrongCount,
+        accuracy,
+        allAnswers
+    };
+}
+
+// 显示结果
+function showResults(results, totalTime) {
+    const container = document.getElementById('resultsContainer');
+    
+    // 隐藏测试界面
+    document.getElementById('progressContainer').style.display = 'none';
+    document.getElementById('questionNav').style.display = 'none';
+    document.getElementById('questionsContainer').style.display = 'none';
+    document.getElementById('navigationContainer').style.display = 'none';
+    
+    // 确定成绩等级
+    let scoreClass = 'score-poor';
+    let scoreText = '需要加强';
+    if (results.accuracy >= 90) {
+        scoreClass = 'score-excellent';
+        scoreText = '优秀';
+    } else if (results.accuracy >= 70) {
+        scoreClass = 'score-good';
+        scoreText = '良好';
+    }
+    
+    // 题目回顾列表只预留容器，条目分块生成
+    let allAnswersHtml = '';
+    if (results.allAnswers.length > 0) {
+        allAnswersHtml = `
+            <div class="all-answers">
+                <h3>题目回顾</h3>
+                <div id="answerList"></div>
+                <div id="answerListEnd" class="answer-list-end"></div>
+            </div>
+        `;
+    }
+    
+    container.innerHTML = `
+        <div class="results-container">
+            <h2 class="results-title">测试完成！</h2>
+            <div class="score-display ${scoreClass}">${results.accuracy}% (${scoreText})</div>
+            
+            <div class="stats-grid">
+                <div class="stat-item">
+                    <div class="stat-value">${results.totalCount}</div>
+                    <div class="stat-label">总题数</div>
+                </div>
+                <div class="stat-item">
+                    <div class="stat-value">${results.correctCount}</div>
+                    <div class="stat-label">正确题数</div>
+                </div>
+                <div class="stat-item">
+                    <div class="stat-value">${results.wrongCount}</div>
+                    <div class="stat-label">错误题数</div>
+                </div>
+                <div class="stat-item">
+                    <div class="stat-value">${Math.floor(totalTime / 60)}:${String(totalTime % 60).padStart(2, '0')}</div>
+                    <div class="stat-label">用时</div>
+                </div>
+            </div>
+            
+            ${allAnswersHtml}
+            
+            <button class="restart-btn" onclick="restartQuiz()">重新开始</button>
+        </div>
+    `;
+    
+    container.style.display = 'block';
+    
+    startReviewList(results.allAnswers);
+}
+
+// 单个题目回顾条目的HTML
+function reviewItemHtml(item) {
+    return `
+                    <div class="answer-item ${item.isCorrect ? 'correct-item' : 'incorrect-item'}">
+                        <div class="answer-question">
+                            <span class="question-status ${item.isCorrect ? 'status-correct' : 'status-incorrect'}">
+                                ${item.isCorrect ? '✓' : '✗'}
+                            </span>
+                            第${item.questionNumber}题: ${item.question}
+                        </div>
+                        <div class="answer-details">
+                            <div class="user-answer ${item.isCorrect ? 'correct-answer' : 'wrong-answer'}">
+                                你的答案: ${item.userAnswer}
+                            </div>
+                            <div class="correct-answer-display">
+                                正确答案: ${item.correctAnswer}
+                            </div>
+                        </div>
+                    </div>
+                `;
+}
+
+// 在浏览器空闲时执行，不支持 requestIdleCallback 时延后执行
+function whenIdle(callback) {
+    if (typeof requestIdleCallback === 'function') {
+        requestIdleCallback(callback, { timeout: 200 });
+    } else {
+        setTimeout(callback, 16);
+    }
+}
+
+// 开始生成题目回顾：先显示第一块，列表末尾接近可见区域时在空闲时间追加下一块
+function startReviewList(items) {
+    stopReviewList();
+    reviewItems = items;
+    reviewRendered = 0;
+    if (!items.length) return;
+    
+    if (!appendReviewChunk()) return;
+    const generation = reviewGeneration;
+    const end = document.getElementById('answerListEnd');
+    if (typeof IntersectionObserver === 'function') {
+        let scheduled = false;
+        reviewObserver = new IntersectionObserver(entries => {
+            if (scheduled || !entries.some(entry => entry.isIntersecting)) return;
+            scheduled = true;
+            whenIdle(() => {
+                scheduled = false;
+                if (generation !== reviewGeneration) return;
+                appendReviewChunk();
+                // 追加后末尾仍在可见区域内时继续生成
+                if (reviewObserver) {
+                    reviewObserver.unobserve(end);
+                    reviewObserver.observe(end);
+                }
+            });
+        }, { rootMargin: '800px 0px' });
+        reviewObserver.observe(end);
+    } else {
+        // 不支持时在空闲时间依次生成全部条目
+        const next = () => {
+            if (generation !== reviewGeneration) return;
+            if (appendReviewChunk()) whenIdle(next);
+        };
+        whenIdle(next);
+    }
+}
+
+// 追加下一块题目回顾条目，返回是否还有未生成的条目
+function appendReviewChunk() {
+    const list = document.getElementById('answerList');
+    if (!list) return false;
+    const end = Math.min(reviewRendered + REVIEW_CHUNK_SIZE, reviewItems.length);
+    let html = '';
+    for (let i = reviewRendered; i < end; i++) {
+        html += reviewItemHtml(reviewItems[i]);
+    }
+    list.insertAdjacentHTML('beforeend', html);
+    reviewRendered = end;
+    if (reviewRendered >= reviewItems.length) {
+        stopReviewList();
+        return false;
+    }
+    return true;
+}
+
+// 停止生成题目回顾（全部生成或重新开始时）
+function stopReviewList() {
+    reviewGeneration++;
+    if (reviewObserver) {
+        reviewObserver.disconnect();
+        reviewObserver = null;
+    }
+}
+
+// 重新开始测试
+function restartQuiz() {
+    // 重置所有状态
+    questions = [...originalQuestions];
+    userAnswers = {};
+    answerCorrect = {};
+    userChoices = {};
+    currentQuestionIndex = 0;
+    answeredCount = 0;
+    navButtons = [];
+    navPageStart = 0;
+    stopReviewList();
+    reviewItems = [];
+    
+    // 隐藏上次停留的题目
+    if (currentQuestionEl) currentQuestionEl.style.display = 'none';
+    currentQuestionEl = null;
+    quizStarted = false;
+    startTime = null;
+    
+    // 重置界面
+    document.querySelector('.quiz-controls').style.display = 'flex';
+    document.getElementById('progressContainer').style.display = 'none';
+    document.getElementById('questionNav').style.display = 'none';
+    document.getElementById('questionsContainer').style.display = 'none';
+    document.getElementById('navigationContainer').style.display = 'none';
+    document.getElementById('resultsContainer').style.display = 'none';
+    
+    // 重置控制选项
+    document.getElementById('shuffleQuestions').checked = false;
+    document.getElementById('shuffleOptions').checked = false;
+}